@@ -0,0 +1,257 @@
+"""Grande arène défilante découpée en chunks, activés autour de la caméra.
+
+Seuls les chunks proches de la caméra ont des sprites dans les groupes du monde (et
+passent donc par la simulation complète, les collisions et l'affichage). Les ennemis,
+projectiles et pièces des autres chunks sont gardés en sommeil sous forme compacte
+(enregistrements struct dans un bytearray par chunk) et simulés grossièrement: chaque
+chunk dormant avance de COARSE_INTERVAL_TICKS ticks d'un coup, une fois tous les
+COARSE_INTERVAL_TICKS ticks, les chunks étant répartis sur les ticks. Le coût suit la
+zone visible et le nombre d'entités endormies / COARSE_INTERVAL_TICKS, pas la taille de l'arène.
+"""
+import math
+import struct
+
+import pygame
+
+from enemy import Enemy, enemy_pool
+from gold import gold_pool
+from projectile import projectile_pool
+from ranged_enemy import RangedEnemy, ranged_enemy_pool
+
+ARENA_CHUNK_SIZE = 400          # côté d'un chunk (px)
+ACTIVE_MARGIN_CHUNKS = 1        # chunks actifs au-delà de ceux que la caméra voit
+COARSE_INTERVAL_TICKS = 30      # un chunk dormant est simulé toutes les 30 ticks (0.5 s)
+
+ENEMY_KINDS = (Enemy, RangedEnemy)
+ENEMY_POOLS = (enemy_pool, ranged_enemy_pool)
+# Tailles des entités en sommeil (celles de leurs images)
+ENEMY_SIZES = (30, 25)
+PROJECTILE_SIZE = 6
+# type, position, hp, max_hp, dégâts, dernier tir, vitesse
+DORMANT_ENEMY = struct.Struct("<Biiddddd")
+# position, vitesse, dégâts
+DORMANT_PROJECTILE = struct.Struct("<iiddd")
+DORMANT_GOLD = struct.Struct("<iiq")
+
+
+class _PlacementRng:
+    """Remplace le hasard des constructeurs d'ennemis, dont la position est écrasée ensuite."""
+
+    @staticmethod
+    def randint(a, b):
+        return a
+
+
+# Partagé avec snapshot.py
+placement_rng = _PlacementRng()
+
+
+class ChunkedArena:
+    """Découpage de l'arène en chunks et mise en sommeil des entités loin de la caméra.
+
+    stream(world) est appelé à chaque tick (phase "streaming" de World.tick), après le
+    déplacement du joueur et de la caméra.
+    """
+
+    def __init__(self, size, chunk_size=ARENA_CHUNK_SIZE, margin=ACTIVE_MARGIN_CHUNKS,
+                 coarse_interval=COARSE_INTERVAL_TICKS):
+        self.rect = pygame.Rect((0, 0), size)
+        self.chunk_size = chunk_size
+        self.margin = margin
+        self.coarse_interval = coarse_interval
+        self.columns = math.ceil(self.rect.width / chunk_size)
+        self.rows = math.ceil(self.rect.height / chunk_size)
+        self.active = set()
+        # chunk -> bytearray d'enregistrements
+        self.enemies = {}
+        self.projectiles = {}
+        self.enemy_projectiles = {}
+        self.golds = {}
+        # Compteurs
+        self.dormant_enemies = 0
+        self.woken = 0
+        self.slept = 0
+
+    # --- Chunks ---
+    def chunk_of(self, x, y):
+        cs = self.chunk_size
+        return (min(max(int(x) // cs, 0), self.columns - 1), min(max(int(y) // cs, 0), self.rows - 1))
+
+    def chunks_around(self, view):
+        cs = self.chunk_size
+        m = self.margin
+        x0 = max(view.left // cs - m, 0)
+        y0 = max(view.top // cs - m, 0)
+        x1 = min((view.right - 1) // cs + m, self.columns - 1)
+        y1 = min((view.bottom - 1) // cs + m, self.rows - 1)
+        return {(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)}
+
+    def clear(self):
+        self.active = set()
+        self.enemies.clear()
+        self.projectiles.clear()
+        self.enemy_projectiles.clear()
+        self.golds.clear()
+        self.dormant_enemies = 0
+
+    # --- Streaming ---
+    def stream(self, world):
+        wanted = self.chunks_around(world.camera)
+        if wanted != self.active:
+            entering = wanted - self.active
+            self.active = wanted
+            self._sleep_outside(world)
+            for key in sorted(entering):
+                self._wake_chunk(world, key)
+        elif world.ticks % self.coarse_interval == 0:
+            # Les sprites actifs qui ont quitté la zone active s'endorment
+            self._sleep_outside(world)
+        self._coarse_step(world)
+
+    def _sleep_outside(self, world):
+        active = self.active
+        chunk_of = self.chunk_of
+        for sprite in world.enemies.sprites():
+            key = chunk_of(*sprite.rect.center)
+            if key not in active:
+                self._append(self.enemies, key, DORMANT_ENEMY.pack(
+                    ENEMY_KINDS.index(type(sprite)), *sprite.rect.topleft, sprite.hp, sprite.max_hp,
+                    sprite.damage, getattr(sprite, 'last_shot', 0), sprite.speed))
+                self.dormant_enemies += 1
+                sprite.kill()
+                self.slept += 1
+        for group, store in ((world.projectiles, self.projectiles), (world.enemy_projectiles, self.enemy_projectiles)):
+            for proj in group.sprites():
+                key = chunk_of(*proj.rect.center)
+                if key not in active:
+                    self._append(store, key, DORMANT_PROJECTILE.pack(*proj.rect.topleft, proj.vel.x, proj.vel.y, proj.damage))
+                    proj.kill()
+                    self.slept += 1
+        for gold in world.golds.sprites():
+            key = chunk_of(*gold.rect.center)
+            if key not in active:
+                self._append(self.golds, key, DORMANT_GOLD.pack(*gold.rect.topleft, gold.value))
+                gold.kill()
+                self.slept += 1
+
+    @staticmethod
+    def _append(store, key, record):
+        data = store.get(key)
+        if data is None:
+            store[key] = bytearray(record)
+        else:
+            data += record
+
+    def _wake_chunk(self, world, key):
+        self._wake_enemies(world, key)
+        self._wake_items(world, key)
+
+    def _wake_enemies(self, world, key):
+        data = self.enemies.pop(key, None)
+        if data:
+            woken = []
+            for kind, x, y, hp, max_hp, damage, last_shot, speed in DORMANT_ENEMY.iter_unpack(data):
+                # Dégâts stockés en double, entiers dans le jeu (comme les hp du joueur)
+                enemy = ENEMY_POOLS[kind].acquire(world.bounds, hp=hp, damage=int(damage), rng=placement_rng)
+                enemy.rect.topleft = (x, y)
+                enemy.max_hp = max_hp
+                enemy.speed = speed
+                if kind:
+                    enemy.last_shot = last_shot
+                woken.append(enemy)
+            world.enemies.add(woken)
+            self.dormant_enemies -= len(woken)
+            self.woken += len(woken)
+
+    def _wake_items(self, world, key):
+        for group, store, cast in ((world.projectiles, self.projectiles, float),
+                                   (world.enemy_projectiles, self.enemy_projectiles, int)):
+            data = store.pop(key, None)
+            if data:
+                for x, y, vx, vy, damage in DORMANT_PROJECTILE.iter_unpack(data):
+                    proj = projectile_pool.acquire((0, 0), (vx, vy), world.bounds, damage=cast(damage))
+                    proj.rect.topleft = (x, y)
+                    proj.last_topleft = (x, y)
+                    group.add(proj)
+                    self.woken += 1
+        data = self.golds.pop(key, None)
+        if data:
+            for x, y, value in DORMANT_GOLD.iter_unpack(data):
+                gold = gold_pool.acquire((0, 0), value=value)
+                gold.rect.topleft = (x, y)
+                world.golds.add(gold)
+                self.woken += 1
+
+    # --- Simulation grossière des chunks dormants ---
+    def _coarse_step(self, world):
+        """Avance d'un intervalle complet les chunks dormants dont c'est le tour."""
+        interval = self.coarse_interval
+        turn = world.ticks % interval
+        due = [key for key in self.enemies if (key[0] * 7 + key[1] * 13) % interval == turn]
+        if due:
+            self._coarse_enemies(world, due, interval)
+        for store in (self.projectiles, self.enemy_projectiles):
+            due = [key for key in store if (key[0] * 7 + key[1] * 13) % interval == turn]
+            if due:
+                self._coarse_projectiles(store, due, interval)
+
+    def _coarse_enemies(self, world, keys, steps):
+        tx, ty = world.player.rect.center
+        bounds = self.rect
+        moved = {}
+        for key in keys:
+            data = self.enemies.pop(key)
+            for kind, x, y, hp, max_hp, damage, last_shot, speed in DORMANT_ENEMY.iter_unpack(data):
+                # Déplacement en ligne droite vers le joueur, sans collisions ni séparation
+                size = ENEMY_SIZES[kind]
+                dx = tx - (x + size // 2)
+                dy = ty - (y + size // 2)
+                length = math.hypot(dx, dy)
+                if length > 0:
+                    step = min(speed * steps, length)
+                    x = min(max(round(x + dx / length * step), bounds.left), bounds.right - size)
+                    y = min(max(round(y + dy / length * step), bounds.top), bounds.bottom - size)
+                record = DORMANT_ENEMY.pack(kind, x, y, hp, max_hp, damage, last_shot, speed)
+                self._append(moved, self.chunk_of(x + size // 2, y + size // 2), record)
+        for key, data in moved.items():
+            self._append(self.enemies, key, data)
+            if key in self.active:
+                # Arrivé dans la zone active: réveillé tout de suite
+                self._wake_enemies(world, key)
+
+    def _coarse_projectiles(self, store, keys, steps):
+        bounds = self.rect
+        moved = {}
+        for key in keys:
+            data = store.pop(key)
+            for x, y, vx, vy, damage in DORMANT_PROJECTILE.iter_unpack(data):
+                x = round(x + vx * steps)
+                y = round(y + vy * steps)
+                # Sorti de l'arène: disparaît, comme Projectile.update
+                if not bounds.colliderect((x, y, PROJECTILE_SIZE, PROJECTILE_SIZE)):
+                    continue
+                key = self.chunk_of(x + PROJECTILE_SIZE // 2, y + PROJECTILE_SIZE // 2)
+                if key in self.active:
+                    # Entré dans la zone active (hors de vue grâce à la marge): il disparaît
+                    continue
+                self._append(moved, key, DORMANT_PROJECTILE.pack(x, y, vx, vy, damage))
+        for key, data in moved.items():
+            self._append(store, key, data)
+
+    # --- Rapport / empreinte ---
+    def dormant_counts(self):
+        return (self.dormant_enemies,
+                sum(len(d) for d in self.projectiles.values()) // DORMANT_PROJECTILE.size
+                + sum(len(d) for d in self.enemy_projectiles.values()) // DORMANT_PROJECTILE.size,
+                sum(len(d) for d in self.golds.values()) // DORMANT_GOLD.size)
+
+    def digest_parts(self):
+        return [sorted(self.active)] + [sorted((key, bytes(data)) for key, data in store.items())
+                                        for store in (self.enemies, self.projectiles, self.enemy_projectiles, self.golds)]
+
+    def report(self):
+        enemies, projectiles, golds = self.dormant_counts()
+        return (f"Arène {self.rect.width}x{self.rect.height}: {len(self.active)}/{self.columns * self.rows} chunks actifs, "
+                f"en sommeil: {enemies} ennemis, {projectiles} projectiles, {golds} pièces; "
+                f"{self.slept} endormis, {self.woken} réveillés")
+
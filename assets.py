@@ -0,0 +1,129 @@
+import os
+import time
+
+import pygame
+
+# Dossier des images du jeu (à côté du dossier du code) et cache disque des images redimensionnées
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Image')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.asset_cache')
+
+
+class AssetManager:
+    """Charge chaque image une seule fois, la convertit au format de l'écran et garde ses variantes.
+
+    Les variantes redimensionnées sont aussi écrites sur disque (CACHE_DIR) pour ne pas
+    refaire le travail au prochain lancement tant que l'image source ne change pas.
+    Les surfaces retournées sont partagées: ne pas les modifier.
+    """
+
+    def __init__(self, image_dir=IMAGE_DIR, cache_dir=CACHE_DIR):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self.images = {}   # nom -> Surface
+        self.scaled = {}   # (nom, taille) -> Surface
+        self.shapes = {}   # (forme, taille, couleur) -> Surface
+        self.load_ms = {}  # nom ou (nom, taille) -> temps de chargement
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.missing = []
+
+    @staticmethod
+    def _convert(surface, alpha):
+        # convert() n'est possible qu'une fois la fenêtre créée
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def path(self, name):
+        return os.path.join(self.image_dir, name)
+
+    def image(self, name):
+        """Image d'origine, chargée et convertie (avec transparence) une seule fois."""
+        surface = self.images.get(name)
+        if surface is None:
+            start = time.perf_counter()
+            surface = self._convert(pygame.image.load(self.path(name)), alpha=True)
+            self.images[name] = surface
+            self.load_ms[name] = (time.perf_counter() - start) * 1000
+        return surface
+
+    def scaled_image(self, name, size):
+        """Image redimensionnée à size, depuis la mémoire, le cache disque ou en la calculant."""
+        size = (int(size[0]), int(size[1]))
+        key = (name, size)
+        surface = self.scaled.get(key)
+        if surface is not None:
+            return surface
+
+        start = time.perf_counter()
+        source = self.path(name)
+        base, _ = os.path.splitext(name)
+        cached = os.path.join(self.cache_dir, f"{base}-{size[0]}x{size[1]}.png")
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(source):
+            surface = self._convert(pygame.image.load(cached), alpha=True)
+            self.disk_hits += 1
+        else:
+            surface = pygame.transform.scale(self.image(name), size)
+            self.disk_misses += 1
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                pygame.image.save(surface, cached)
+            except (OSError, pygame.error) as e:
+                print(f"Cache d'images indisponible ({cached}): {e}")
+        self.scaled[key] = surface
+        self.load_ms[key] = (time.perf_counter() - start) * 1000
+        return surface
+
+    def solid(self, size, color):
+        """Rectangle plein de couleur color, partagé par tous les sprites identiques."""
+        key = ('solid', tuple(size), color)
+        surface = self.shapes.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            surface = self._convert(surface, alpha=False)
+            self.shapes[key] = surface
+        return surface
+
+    def circle(self, size, color):
+        """Disque de diamètre size sur fond transparent, partagé."""
+        key = ('circle', size, color)
+        surface = self.shapes.get(key)
+        if surface is None:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (size//2, size//2), size//2)
+            surface = self._convert(surface, alpha=True)
+            self.shapes[key] = surface
+        return surface
+
+    def preload(self, scaled=()):
+        """Charge au démarrage les images redimensionnées listées [(nom, taille), ...].
+
+        Les images manquantes sont notées dans le rapport et ignorées (les sprites ont un rendu de secours).
+        Retourne le temps total en ms.
+        """
+        start = time.perf_counter()
+        for name, size in scaled:
+            try:
+                self.scaled_image(name, size)
+            except (pygame.error, FileNotFoundError):
+                self.missing.append(name)
+        return (time.perf_counter() - start) * 1000
+
+    def report(self):
+        total = sum(self.load_ms.values())
+        details = ", ".join(f"{key if isinstance(key, str) else '%s@%dx%d' % (key[0], *key[1])} {ms:.1f} ms"
+                            for key, ms in self.load_ms.items())
+        return (f"Assets: {len(self.images)} images, {len(self.scaled)} variantes, {len(self.shapes)} formes, "
+                f"{total:.1f} ms de chargement (cache disque: {self.disk_hits} hits, {self.disk_misses} misses)"
+                + (f" [{details}]" if details else "")
+                + (f", manquantes: {', '.join(self.missing)}" if self.missing else ""))
+
+
+# Gestionnaire partagé par tous les sprites
+assets = AssetManager()
+
+
+def circle_image(size, color):
+    """Retourne un disque de diamètre size, rendu une seule fois et partagé (ne pas modifier)."""
+    return assets.circle(size, color)
@@ -0,0 +1,170 @@
+"""Simulateur d'équilibrage: des milliers de missions jouées par l'IA en parallèle.
+
+Chaque mission est jouée sans affichage par headless.kite_policy pour une combinaison
+(niveau du joueur, nombre d'extractions déjà faites, configuration des bâtiments, graine).
+Les résultats bruts sont écrits au fil de l'eau (une ligne JSON par mission) et le
+résumé par combinaison (taux de mort, temps avant extraction, or/XP par minute) est
+réécrit régulièrement, donc une longue campagne interrompue garde ses résultats.
+
+Usage: python balance.py --levels 1 3 5 --extractions 0 2 4 --seeds 50 --workers 8
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+# Sans gestionnaire SIGTERM de SDL dans les processus du pool: ils doivent rester arrêtables
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import argparse
+import csv
+import json
+import multiprocessing
+import time
+
+from world import TICK_MS
+
+BUILDING_NAMES = ("Armurerie", "Forge", "Marché", "Temple", "Bibliothèque")
+
+# Configurations de bâtiments testées: nom -> niveau de chaque bâtiment
+BUILDING_CONFIGS = {
+    "aucun": {},
+    "armurerie_5": {"Armurerie": 5},
+    "forge_5": {"Forge": 5},
+    "temple_5": {"Temple": 5},
+    "marche_5": {"Marché": 5},
+    "bibliotheque_5": {"Bibliothèque": 5},
+    "tous_3": {name: 3 for name in BUILDING_NAMES},
+    "tous_10": {name: 10 for name in BUILDING_NAMES},
+}
+
+MAX_MISSION_TICKS = 60 * 60 * 3    # 3 minutes simulées au plus par mission
+SUMMARY_EVERY = 200                # résumé réécrit toutes les 200 missions
+SUMMARY_FIELDS = ["level", "extractions", "buildings", "missions", "death_rate", "timeout_rate",
+                  "extract_time_s", "gold_per_min", "xp_per_min"]
+
+
+def simulate(job):
+    """Joue une mission et retourne ses résultats (exécuté dans un processus du pool)."""
+    from headless import make_world, run, kite_policy, WIDTH, HEIGHT
+    from base import BaseZone
+    from player import Player
+    import pygame
+
+    seed, level, extractions, config, max_ticks = job
+    # Les bâtiments n'ont besoin que des polices (pas de pygame.init(): ni son ni timer SDL)
+    pygame.font.init()
+    screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+    buildings = BaseZone(WIDTH, HEIGHT, Player(screen_rect)).buildings
+    for building in buildings:
+        building.level = BUILDING_CONFIGS[config].get(building.name, 0)
+
+    world = make_world(seed, buildings=buildings, player_level=level, extractions=extractions)
+    player = world.player
+    start_level = player.level
+    ticks = run(world, max_ticks, kite_policy)
+
+    # XP totale gagnée: celle qui reste + celle consommée par les montées de niveau
+    xp = world.banked_xp + sum(range(start_level, player.level)) * 100
+    return {
+        "seed": seed, "level": level, "extractions": extractions, "buildings": config,
+        "outcome": world.state if world.state != "running" else "timeout",
+        "seconds": ticks * TICK_MS / 1000,
+        "gold": world.banked_gold, "xp": xp, "end_level": player.level,
+    }
+
+
+class BalanceSummary:
+    """Agrège les résultats par (niveau, extractions, bâtiments)."""
+
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, result):
+        key = (result["level"], result["extractions"], result["buildings"])
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {"missions": 0, "dead": 0, "timeout": 0, "extracted": 0,
+                                        "extract_seconds": 0.0, "seconds": 0.0, "gold": 0, "xp": 0}
+        group["missions"] += 1
+        group[result["outcome"]] += 1
+        group["seconds"] += result["seconds"]
+        group["gold"] += result["gold"]
+        group["xp"] += result["xp"]
+        if result["outcome"] == "extracted":
+            group["extract_seconds"] += result["seconds"]
+
+    def rows(self):
+        for (level, extractions, config), g in sorted(self.groups.items()):
+            minutes = g["seconds"] / 60 or 1.0
+            yield {
+                "level": level, "extractions": extractions, "buildings": config,
+                "missions": g["missions"],
+                "death_rate": round(g["dead"] / g["missions"], 3),
+                "timeout_rate": round(g["timeout"] / g["missions"], 3),
+                "extract_time_s": round(g["extract_seconds"] / g["extracted"], 1) if g["extracted"] else "",
+                "gold_per_min": round(g["gold"] / minutes, 1),
+                "xp_per_min": round(g["xp"] / minutes, 1),
+            }
+
+    def write_csv(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+        os.replace(tmp, path)
+
+
+def make_jobs(levels, extractions, configs, seeds, max_ticks=MAX_MISSION_TICKS):
+    return [(seed, level, extraction, config, max_ticks)
+            for level in levels for extraction in extractions for config in configs
+            for seed in range(seeds)]
+
+
+def run_campaign(jobs, out_prefix="balance", workers=None, chunksize=4):
+    """Joue jobs sur un pool de processus; écrit <out_prefix>.jsonl et <out_prefix>_summary.csv."""
+    summary = BalanceSummary()
+    raw_path = out_prefix + ".jsonl"
+    summary_path = out_prefix + "_summary.csv"
+    start = time.perf_counter()
+    with open(raw_path, "w", encoding="utf-8") as raw, multiprocessing.Pool(workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(simulate, jobs, chunksize=chunksize), 1):
+            raw.write(json.dumps(result) + "\n")
+            summary.add(result)
+            if done % SUMMARY_EVERY == 0:
+                raw.flush()
+                summary.write_csv(summary_path)
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{len(jobs)} missions ({done / elapsed:.0f} missions/s)")
+        # Arrêt normal des processus: la sortie du bloc appelle terminate()
+        pool.close()
+        pool.join()
+    summary.write_csv(summary_path)
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs)} missions en {elapsed:.1f}s; résultats: {raw_path}, résumé: {summary_path}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulateur d'équilibrage de la courbe de difficulté")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--extractions", type=int, nargs="+", default=[0, 2, 4, 8])
+    parser.add_argument("--buildings", nargs="+", default=list(BUILDING_CONFIGS),
+                        help=f"parmi {', '.join(BUILDING_CONFIGS)}")
+    parser.add_argument("--seeds", type=int, default=20, help="missions par combinaison")
+    parser.add_argument("--max-ticks", type=int, default=MAX_MISSION_TICKS)
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut: un par cœur)")
+    parser.add_argument("--out", default="balance", help="préfixe des fichiers de résultats")
+    args = parser.parse_args()
+    unknown = [name for name in args.buildings if name not in BUILDING_CONFIGS]
+    if unknown:
+        parser.error(f"configuration inconnue: {', '.join(unknown)}")
+
+    jobs = make_jobs(args.levels, args.extractions, args.buildings, args.seeds, args.max_ticks)
+    summary = run_campaign(jobs, args.out, args.workers)
+    for row in summary.rows():
+        print(f"niv {row['level']:>2} ext {row['extractions']:>2} {row['buildings']:<15} "
+              f"mort {row['death_rate']:>5.0%} extraction {row['extract_time_s'] or '-':>6}s "
+              f"or/min {row['gold_per_min']:>7} xp/min {row['xp_per_min']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 import pygame
+from text_cache import text_cache
 from building import Building
 
+VILLAGE_SIZE = 600  # le village fait 600x600 (coordonnées monde)
+TERRAIN_COLOR = (34, 139, 34)  # Vert foncé pour le terrain
+MESSAGE_DURATION_MS = 2000  # durée d'affichage des messages temporaires
+
 class BaseZone:
     def __init__(self, width, height, player):
         self.width = width
         self.height = height
         self.player = player
-        self.font_title = pygame.font.SysFont(None, 48)
-        self.font_text = pygame.font.SysFont(None, 28)
-        self.font_small = pygame.font.SysFont(None, 20)
+        # Polices chargées une seule fois par le cache de texte (on garde leur spec)
+        self.font_title = (None, 48)
+        self.font_text = (None, 28)
+        self.font_small = (None, 20)
+        text_cache.preload(self.font_title, self.font_text, self.font_small)
         
         # Caméra / déplacement
         self.camera_x = 0
@@ -31,10 +38,15 @@ class BaseZone:
         self.menu_btn = pygame.Rect(20, 20, 100, 40)
         self.selected_building = None
         self.message = None
-        self.message_timer = 0
+        self.message_until = 0  # get_ticks() jusqu'auquel le message reste affiché
+        self.hovered = (False, False)  # survol des boutons (lancer, menu)
+        
+        # Couche monde pré-rendue (terrain + bâtiments), refaite seulement après une amélioration
+        self.world_surface = None
 
     def update(self):
-        """Gérer le déplacement du joueur."""
+        """Gérer le déplacement du joueur. Retourne True si la vue a changé."""
+        previous = (self.player_x, self.player_y)
         keys = pygame.key.get_pressed()
         if keys[pygame.K_UP] or keys[pygame.K_w]:
             self.player_y -= self.player_speed
@@ -46,44 +58,77 @@ class BaseZone:
             self.player_x += self.player_speed
         
         # Contraindre le joueur dans les limites du village
-        self.player_x = max(0, min(self.player_x, 600 - 30))
-        self.player_y = max(0, min(self.player_y, 600 - 30))
+        self.player_x = max(0, min(self.player_x, VILLAGE_SIZE - 30))
+        self.player_y = max(0, min(self.player_y, VILLAGE_SIZE - 30))
         
         # Mettre à jour la caméra pour suivre le joueur
         self.camera_x = self.player_x - self.width // 2 + 15
         self.camera_y = self.player_y - self.height // 2 + 15
-        self.camera_x = max(0, min(self.camera_x, 600 - self.width))
-        self.camera_y = max(0, min(self.camera_y, 600 - self.height))
+        self.camera_x = max(0, min(self.camera_x, VILLAGE_SIZE - self.width))
+        self.camera_y = max(0, min(self.camera_y, VILLAGE_SIZE - self.height))
+        return (self.player_x, self.player_y) != previous
 
-    def draw(self, screen):
-        screen.fill((34, 139, 34))  # Vert foncé pour le terrain
-        
-        # Titre
-        title = self.font_title.render("Village - Utilisez les flèches pour vous déplacer", True, (100, 255, 100))
-        screen.blit(title, (20, 20))
-        
-        # Afficher les bâtiments (avec offset caméra)
+    def update_hover(self, mouse_pos):
+        """Met à jour le survol des boutons. Retourne True s'il a changé."""
+        hovered = (self.launch_mission_btn.collidepoint(mouse_pos), self.menu_btn.collidepoint(mouse_pos))
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
+
+    def show_message(self, message):
+        self.message = message
+        self.message_until = pygame.time.get_ticks() + MESSAGE_DURATION_MS
+
+    def message_visible(self):
+        return bool(self.message) and pygame.time.get_ticks() < self.message_until
+
+    def message_time_left(self):
+        """Millisecondes avant la disparition du message (None s'il n'y en a pas)."""
+        if not self.message_visible():
+            return None
+        return self.message_until - pygame.time.get_ticks()
+
+    def invalidate_world(self):
+        """À appeler quand un bâtiment change: la couche monde sera refaite au prochain draw."""
+        self.world_surface = None
+
+    def render_world(self):
+        """Dessine le terrain et les bâtiments une fois, en coordonnées monde."""
+        surface = pygame.Surface((VILLAGE_SIZE, VILLAGE_SIZE))
+        surface.fill(TERRAIN_COLOR)
         for building in self.buildings:
-            adjusted_rect = pygame.Rect(building.rect.x - self.camera_x, building.rect.y - self.camera_y, 
-                                        building.rect.width, building.rect.height)
-            pygame.draw.rect(screen, building.color, adjusted_rect)
-            pygame.draw.rect(screen, (255, 255, 255), adjusted_rect, 2)
+            rect = building.rect
+            pygame.draw.rect(surface, building.color, rect)
+            pygame.draw.rect(surface, (255, 255, 255), rect, 2)
             
-            text = self.font_small.render(building.name, True, (255, 255, 255))
-            screen.blit(text, (adjusted_rect.x + 5, adjusted_rect.y + 5))
+            text = text_cache.render(self.font_small, building.name, True, (255, 255, 255))
+            surface.blit(text, (rect.x + 5, rect.y + 5))
             
             # Afficher le niveau
-            level_text = self.font_small.render(f"Lvl {building.level}", True, (100, 255, 100))
-            screen.blit(level_text, (adjusted_rect.x + 5, adjusted_rect.y + 25))
+            level_text = text_cache.render(self.font_small, f"Lvl {building.level}", True, (100, 255, 100))
+            surface.blit(level_text, (rect.x + 5, rect.y + 25))
             
             # Afficher le coût du prochain upgrade si possible
             if building.level < building.max_level:
                 cost = building.get_upgrade_cost()
-                price_text = self.font_small.render(f"+: {cost}g", True, (255, 215, 0))
-                screen.blit(price_text, (adjusted_rect.x + 5, adjusted_rect.y + 55))
+                price_text = text_cache.render(self.font_small, f"+: {cost}g", True, (255, 215, 0))
+                surface.blit(price_text, (rect.x + 5, rect.y + 55))
             else:
-                max_text = self.font_small.render("MAX", True, (100, 255, 100))
-                screen.blit(max_text, (adjusted_rect.x + 5, adjusted_rect.y + 55))
+                max_text = text_cache.render(self.font_small, "MAX", True, (100, 255, 100))
+                surface.blit(max_text, (rect.x + 5, rect.y + 55))
+        self.world_surface = surface.convert() if pygame.display.get_surface() else surface
+
+    def draw(self, screen):
+        screen.fill(TERRAIN_COLOR)
+        
+        # Fenêtre de la caméra dans la couche monde pré-rendue
+        if self.world_surface is None:
+            self.render_world()
+        screen.blit(self.world_surface, (0, 0), (self.camera_x, self.camera_y, self.width, self.height))
+        
+        # Titre
+        title = text_cache.render(self.font_title, "Village - Utilisez les flèches pour vous déplacer", True, (100, 255, 100))
+        screen.blit(title, (20, 20))
         
         # Afficher le joueur
         player_screen_x = self.player_x - self.camera_x
@@ -97,32 +142,30 @@ class BaseZone:
             f"Niveau: {self.player.level} | XP: {self.player.xp} | Or banké: {self.player.gold}",
         ]
         for stat in stats:
-            text = self.font_small.render(stat, True, (255, 255, 255))
+            text = text_cache.render(self.font_small, stat, True, (255, 255, 255))
             screen.blit(text, (20, y_offset))
             y_offset += 25
         
         # Message temporaire
-        if self.message and self.message_timer > 0:
-            msg_text = self.font_small.render(self.message, True, (255, 200, 0))
+        if self.message_visible():
+            msg_text = text_cache.render(self.font_small, self.message, True, (255, 200, 0))
             screen.blit(msg_text, (self.width // 2 - msg_text.get_width() // 2, 100))
-            self.message_timer -= 1
         
         # Bouton Lancer Mission
-        mouse_pos = pygame.mouse.get_pos()
-        hover_launch = self.launch_mission_btn.collidepoint(mouse_pos)
+        # Survol mis à jour par update_hover (position déjà ramenée à la résolution interne)
+        hover_launch, hover_menu = self.hovered
         btn_color = (0, 200, 0) if hover_launch else (0, 150, 0)
         pygame.draw.rect(screen, btn_color, self.launch_mission_btn)
         pygame.draw.rect(screen, (255, 255, 255), self.launch_mission_btn, 2)
-        launch_text = self.font_text.render("LANCER MISSION", True, (255, 255, 255))
+        launch_text = text_cache.render(self.font_text, "LANCER MISSION", True, (255, 255, 255))
         screen.blit(launch_text, (self.launch_mission_btn.x + self.launch_mission_btn.width // 2 - launch_text.get_width() // 2,
                                    self.launch_mission_btn.y + self.launch_mission_btn.height // 2 - launch_text.get_height() // 2))
         
         # Bouton Menu
-        hover_menu = self.menu_btn.collidepoint(mouse_pos)
         menu_color = (150, 150, 150) if hover_menu else (100, 100, 100)
         pygame.draw.rect(screen, menu_color, self.menu_btn)
         pygame.draw.rect(screen, (255, 255, 255), self.menu_btn, 2)
-        menu_text = self.font_small.render("Menu", True, (255, 255, 255))
+        menu_text = text_cache.render(self.font_small, "Menu", True, (255, 255, 255))
         screen.blit(menu_text, (self.menu_btn.x + self.menu_btn.width // 2 - menu_text.get_width() // 2,
                                 self.menu_btn.y + self.menu_btn.height // 2 - menu_text.get_height() // 2))
 
@@ -134,11 +177,10 @@ class BaseZone:
         elif self.menu_btn.collidepoint(pos):
             return "menu"
         
-        # Vérifier les bâtiments (avec offset caméra)
+        # Vérifier les bâtiments en coordonnées monde
+        world_pos = (pos[0] + self.camera_x, pos[1] + self.camera_y)
         for building in self.buildings:
-            adjusted_rect = pygame.Rect(building.rect.x - self.camera_x, building.rect.y - self.camera_y, 
-                                        building.rect.width, building.rect.height)
-            if adjusted_rect.collidepoint(pos):
+            if building.rect.collidepoint(world_pos):
                 return ("building", building)
         
         return None
@@ -148,13 +190,11 @@ class BaseZone:
         cost = building.get_upgrade_cost()
         if building.level < building.max_level and banked_gold >= cost:
             building.upgrade()
-            self.message = f"{building.name} amélioré au niveau {building.level}!"
-            self.message_timer = 120  # 2 secondes à 60 FPS
+            self.invalidate_world()
+            self.show_message(f"{building.name} amélioré au niveau {building.level}!")
             return cost
         elif building.level >= building.max_level:
-            self.message = f"{building.name} est au maximum!"
-            self.message_timer = 120
+            self.show_message(f"{building.name} est au maximum!")
         else:
-            self.message = f"Or insuffisant! Il vous faut {cost}g"
-            self.message_timer = 120
+            self.show_message(f"Or insuffisant! Il vous faut {cost}g")
         return 0
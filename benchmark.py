@@ -0,0 +1,469 @@
+"""Benchmarks hors écran des chemins chauds de la boucle de jeu.
+
+Usage:
+    python benchmark.py                         # scénarios, comparés à la baseline si elle existe
+    python benchmark.py scenarios --scenario enemies_1k --ticks 300
+    python benchmark.py scenarios --save-baseline
+    python benchmark.py separation swarm collision snapshot lod arena batch waves scale  # micro-benchmarks
+
+Baseline: bench_baseline.json, à côté de ce fichier (ou le chemin donné par --baseline).
+Elle n'est pas fournie avec le dépôt, les temps dépendant de la machine: la créer une
+fois avec `python benchmark.py scenarios --save-baseline` sur la machine de mesure (par
+ex. avant une modification), puis relancer `python benchmark.py` pour s'y comparer.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import random
+import time
+
+import pygame
+
+from spatial import SeparationSolver, separate_all_bruteforce
+from swarm import SwarmGroup, HAVE_NUMPY
+from collision import SweptCollider
+from enemy import enemy_pool
+
+# Nombre d'ennemis par écran 800x600 gardé constant pour mesurer le passage à l'échelle
+ENEMIES_PER_SCREEN = 100
+
+
+def make_blocks(n, seed=0, size=30):
+    """Crée n sprites carrés répartis avec une densité constante."""
+    rng = random.Random(seed)
+    scale = max(1.0, (n / ENEMIES_PER_SCREEN) ** 0.5)
+    width, height = int(800 * scale), int(600 * scale)
+    sprites = []
+    for _ in range(n):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(0, 0, size, size)
+        sprite.rect.center = (rng.randint(0, width), rng.randint(0, height))
+        sprites.append(sprite)
+    return sprites
+
+
+def time_call(fn, setup=None, repeat=5):
+    """Retourne le meilleur temps (ms) sur repeat appels de fn(setup())."""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def bench_separation(counts=(100, 500, 1000, 2000, 5000), passes=2, bruteforce_max=1000):
+    print(f"{'ennemis':>8} {'grille ms':>10} {'ms/1k':>8} {'O(n²) ms':>10}")
+    for n in counts:
+        # Un jeu de positions neuf par répétition pour ne pas mesurer un état déjà résolu
+        solver = SeparationSolver(passes=passes)
+        grid_ms = time_call(solver.solve, setup=lambda: make_blocks(n), repeat=3)
+        brute = "-"
+        if n <= bruteforce_max:
+            brute_ms = time_call(separate_all_bruteforce, setup=lambda: make_blocks(n), repeat=1)
+            brute = f"{brute_ms:.2f}"
+        print(f"{n:>8} {grid_ms:>10.2f} {grid_ms / n * 1000:>8.2f} {brute:>10}")
+
+
+def make_shots(n, seed=1, speed=40, size=6):
+    """n projectiles rapides, répartis comme make_blocks, avec leur position au tick précédent."""
+    rng = random.Random(seed)
+    shots = []
+    for sprite in make_blocks(n, seed=seed, size=size):
+        angle = rng.uniform(0, 2 * math.pi)
+        sprite.last_topleft = sprite.rect.topleft
+        sprite.rect.x += round(math.cos(angle) * speed)
+        sprite.rect.y += round(math.sin(angle) * speed)
+        shots.append(sprite)
+    return shots
+
+
+def bench_collision(counts=(100, 1000, 5000), shots=200, speed=40):
+    print(f"{'ennemis':>8} {'balayé ms':>10} {'tests':>7} {'touchés':>8} {'groupcollide ms':>16} {'touchés':>8}")
+    for n in counts:
+        enemies = pygame.sprite.Group(make_blocks(n))
+        projectiles = pygame.sprite.Group(make_shots(shots, speed=speed))
+        collider = SweptCollider()
+        swept_ms = time_call(lambda: collider.collide(projectiles, enemies, dokill=False))
+        swept_hits = len(collider.collide(projectiles, enemies, dokill=False))
+        group_ms = time_call(lambda: pygame.sprite.groupcollide(projectiles, enemies, False, False))
+        group_hits = len(pygame.sprite.groupcollide(projectiles, enemies, False, False))
+        print(f"{n:>8} {swept_ms:>10.2f} {collider.last_tests:>7} {swept_hits:>8} {group_ms:>16.2f} {group_hits:>8}")
+
+
+def bench_swarm(counts=(1000, 5000, 10000), ticks=30):
+    """Compare enemies.update(player) sprite par sprite et le mode essaim vectorisé."""
+    if not HAVE_NUMPY:
+        print("numpy absent: benchmark essaim ignoré")
+        return
+    pygame.init()
+    from enemy import Enemy
+    screen_rect = pygame.Rect(0, 0, 800, 600)
+    target = pygame.sprite.Sprite()
+    target.rect = pygame.Rect(385, 285, 30, 30)
+    print(f"{'ennemis':>8} {'sprites ms/tick':>16} {'essaim ms/tick':>15}")
+    for n in counts:
+        random.seed(n)
+        group = pygame.sprite.Group([Enemy(screen_rect) for _ in range(n)])
+        swarm = SwarmGroup(screen_rect, group.sprites())
+        sprite_ms = time_call(lambda: [pygame.sprite.Group.update(group, target) for _ in range(ticks)], repeat=3) / ticks
+        swarm_ms = time_call(lambda: [swarm.update(target) for _ in range(ticks)], repeat=3) / ticks
+        print(f"{n:>8} {sprite_ms:>16.2f} {swarm_ms:>15.2f}")
+
+
+# --- Scénarios de boucle de jeu complète ---
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+WARMUP_TICKS = 10
+REGRESSION_TOLERANCE = 0.15  # +15% sur p50 ou p95 = régression signalée
+
+
+def _keep_running(world):
+    """Le joueur ne meurt pas et ne s'extrait pas pendant la mesure."""
+    world.player.max_hp = world.player.hp = 10 ** 9
+    world.extraction_next_spawn = float("inf")
+
+
+def _populate(world, count, ranged_ratio=0.0):
+    from enemy import Enemy
+    from ranged_enemy import RangedEnemy
+    rng = world.rng
+    for enemy in world.enemies.sprites():
+        enemy.kill()
+    world.enemies.add([
+        (RangedEnemy if rng.random() < ranged_ratio else Enemy)(world.bounds, rng=rng)
+        for _ in range(count)
+    ])
+
+
+def _horde(count, ranged_ratio=0.0):
+    def setup(world):
+        _populate(world, count, ranged_ratio)
+    return setup
+
+
+def _rapid_fire(world):
+    _populate(world, 200)
+    world.player.shot_cooldown = 0
+
+
+def _gold_litter(world):
+    from gold import gold_pool
+    _populate(world, 100)
+    rng = world.rng
+    for _ in range(3000):
+        pos = (rng.randint(0, world.screen_rect.width), rng.randint(0, world.screen_rect.height))
+        world.golds.add(gold_pool.acquire(pos, value=1))
+
+
+def _spray_policy(world):
+    """Tire 20 projectiles par tick dans toutes les directions (tir rapide)."""
+    from world import TickInput
+    cx, cy = world.player.rect.center
+    shots = [(cx + 100 * dx, cy + 100 * dy) for dx, dy in
+             ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1))]
+    return TickInput(0, 0, shots * 2 + shots[:4])
+
+
+# nom -> (préparation du monde, politique d'entrée ou None pour la politique "kite")
+SCENARIOS = {
+    "enemies_100": (_horde(100), None),
+    "enemies_1k": (_horde(1000), None),
+    "enemies_5k": (_horde(5000), None),
+    "ranged_mix_1k": (_horde(1000, ranged_ratio=0.4), None),
+    "rapid_fire": (_rapid_fire, _spray_policy),
+    "gold_litter": (_gold_litter, None),
+}
+
+
+def percentile(sorted_values, p):
+    """Percentile au rang le plus proche d'une liste déjà triée."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def run_scenario(name, ticks=120, seed=0):
+    """Joue un scénario et retourne {phase: {p50, p95, p99, max}} en ms/tick."""
+    from headless import make_world, kite_policy
+    from render import draw_mission
+
+    setup, policy = SCENARIOS[name]
+    policy = policy or kite_policy
+    world = make_world(seed)
+    _keep_running(world)
+    setup(world)
+    screen = pygame.Surface(world.screen_rect.size)
+
+    samples = {}
+
+    def record(phase, ms):
+        samples.setdefault(phase, []).append(ms)
+
+    for i in range(WARMUP_TICKS + ticks):
+        on_phase = record if i >= WARMUP_TICKS else None
+        start = time.perf_counter()
+        world.tick(policy(world), on_phase=on_phase)
+        draw_mission(screen, world, on_phase=on_phase)
+        if on_phase:
+            record("total", (time.perf_counter() - start) * 1000)
+
+    stats = {}
+    for phase, values in samples.items():
+        values.sort()
+        stats[phase] = {p: percentile(values, q) for p, q in (("p50", 50), ("p95", 95), ("p99", 99))}
+        stats[phase]["max"] = values[-1]
+    return stats
+
+
+def print_scenario(name, stats, baseline=None):
+    reference = (baseline or {}).get(name, {})
+    print(f"-- {name} --")
+    print(f"{'phase':>16} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  vs baseline")
+    regressions = 0
+    for phase, s in stats.items():
+        diff = ""
+        ref = reference.get(phase)
+        if ref:
+            changes = []
+            for key in ("p50", "p95"):
+                if ref[key] > 0:
+                    change = (s[key] - ref[key]) / ref[key]
+                    changes.append(f"{key} {change:+.0%}")
+                    # Les phases sous 0.05 ms sont trop bruitées pour être signalées
+                    if change > REGRESSION_TOLERANCE and s[key] > 0.05:
+                        regressions += 1
+                        changes[-1] += " !"
+            diff = ", ".join(changes)
+        print(f"{phase:>16} {s['p50']:>8.3f} {s['p95']:>8.3f} {s['p99']:>8.3f} {s['max']:>8.3f}  {diff}")
+    return regressions
+
+
+def bench_scenarios(names=None, ticks=120, baseline_path=BASELINE_PATH, save_baseline=False):
+    baseline = None
+    if os.path.exists(baseline_path) and not save_baseline:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = {}
+    regressions = 0
+    for name in names or SCENARIOS:
+        results[name] = run_scenario(name, ticks)
+        regressions += print_scenario(name, results[name], baseline)
+    if save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Baseline enregistrée dans {baseline_path}")
+    elif baseline is not None:
+        print(f"{regressions} régression(s) au-delà de {REGRESSION_TOLERANCE:.0%}")
+    else:
+        print(f"Pas de baseline dans {baseline_path}: la créer avec --save-baseline")
+    return regressions
+
+
+def bench_snapshot(names=("enemies_100", "enemies_1k", "rapid_fire", "gold_litter"), ticks=60):
+    import snapshot
+    from headless import make_world, run, kite_policy
+    print(f"{'scénario':<14} {'octets':>8} {'dumps ms':>9} {'loads ms':>9}")
+    for name in names:
+        setup, policy = SCENARIOS[name]
+        world = make_world(seed=0)
+        setup(world)
+        _keep_running(world)
+        run(world, ticks, policy or kite_policy)
+        data = snapshot.dumps(world, [])
+        dump_ms = time_call(lambda: snapshot.dumps(world, []))
+        load_ms = time_call(lambda: snapshot.loads(data, world, []))
+        print(f"{name:<14} {len(data):>8} {dump_ms:>9.3f} {load_ms:>9.3f}")
+
+
+def bench_lod(counts=(100, 1000, 5000), ticks=60, budget_ms=None):
+    """Phase update des ennemis (sprites) avec et sans ordonnanceur LOD, mêmes graines."""
+    from headless import make_world, run, kite_policy
+    from lod import UpdateScheduler
+    print(f"{'ennemis':>8} {'complet ms/tick':>16} {'LOD ms/tick':>12} {'évités/tick':>12} {'reportés':>9}")
+    for n in counts:
+        results = []
+        for lod in (None, UpdateScheduler(budget_ms=budget_ms)):
+            world = make_world(seed=0, swarm=False, lod=lod)
+            _horde(n)(world)
+            _keep_running(world)
+            update_ms = [0.0]
+
+            def record(phase, ms):
+                if phase == "update":
+                    update_ms[0] += ms
+
+            def policy(world):
+                inp = kite_policy(world)
+                inp.lod_quota = lod.suggest_quota() if lod else None
+                return inp
+
+            for _ in range(ticks):
+                world.tick(policy(world), on_phase=record)
+            results.append(update_ms[0] / ticks)
+        print(f"{n:>8} {results[0]:>16.2f} {results[1]:>12.2f} {lod.total_saved / lod.ticks:>12.1f} "
+              f"{lod.total_postponed:>9}")
+
+
+def bench_arena(counts=(1000, 5000, 10000), ticks=60):
+    """Grande arène (densité constante) avec chunks streamés autour de la caméra, comparée
+    à la même arène entièrement active (marge couvrant toute l'arène)."""
+    from headless import make_world, run, kite_policy
+    from arena import ChunkedArena
+    print(f"{'ennemis':>8} {'arène':>11} {'streamé ms/tick':>16} {'actifs':>7} {'tout actif ms/tick':>19}")
+    for n in counts:
+        scale = max(1.0, (n / ENEMIES_PER_SCREEN) ** 0.5)
+        size = (int(800 * scale), int(600 * scale))
+        results = []
+        for margin in (1, 1000):
+            world = make_world(seed=0, arena=ChunkedArena(size, margin=margin))
+            _horde(n)(world)
+            _keep_running(world)
+            run(world, WARMUP_TICKS, kite_policy)
+            start = time.perf_counter()
+            run(world, ticks, kite_policy)
+            results.append(((time.perf_counter() - start) * 1000 / ticks, len(world.enemies)))
+        (streamed, active), (full, _) = results
+        print(f"{n:>8} {size[0]:>5}x{size[1]:<5} {streamed:>16.2f} {active:>7} {full:>19.2f}")
+
+
+def _batch_layers(n, spread, seed=0, shared=True):
+    """Groupes ennemis / ennemis à distance / projectiles / pièces (n sprites au total),
+    répartis sur spread écrans 800x600; shared=False donne à chaque sprite sa propre image."""
+    from assets import assets, circle_image
+    rng = random.Random(seed)
+    width, height = int(800 * spread ** 0.5), int(600 * spread ** 0.5)
+    kinds = [(assets.solid((30, 30), (255, 0, 0)), 0.35), (assets.solid((25, 25), (255, 165, 0)), 0.15),
+             (circle_image(6, (255, 255, 0)), 0.3), (circle_image(8, (255, 215, 0)), 0.2)]
+    layers = []
+    for image, share in kinds:
+        group = pygame.sprite.Group()
+        for _ in range(int(n * share)):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = image if shared else image.copy()
+            sprite.rect = sprite.image.get_rect(center=(rng.randint(0, width), rng.randint(0, height)))
+            group.add(sprite)
+        layers.append((group, False))
+    # Caméra au centre de la zone
+    return layers, (width // 2 - 400, height // 2 - 300)
+
+
+def bench_batch(counts=(1000, 10000), repeat=20):
+    """Affichage des sprites: un blits par groupe (images séparées puis partagées, sans
+    élimination hors champ) contre SpriteBatch (un seul blits; trié par image et hors champ
+    éliminé quand les sprites couvrent plusieurs écrans)."""
+    from render import SpriteBatch
+    screen = pygame.Surface((800, 600))
+    batch = SpriteBatch()
+
+    def per_group(layers, offset):
+        ox, oy = offset
+        for group, _ in layers:
+            screen.blits([(s.image, (s.rect.x - ox, s.rect.y - oy)) for s in group], doreturn=False)
+
+    print(f"{'sprites':>8} {'écrans':>7} {'séparées ms':>12} {'partagées ms':>13} {'batch ms':>9} {'dessinés':>9}")
+    for n in counts:
+        for spread in (1, max(1, n // ENEMIES_PER_SCREEN)):
+            separate, offset = _batch_layers(n, spread, shared=False)
+            shared, _ = _batch_layers(n, spread)
+            old = time_call(lambda: per_group(separate, offset), repeat=repeat)
+            grouped = time_call(lambda: per_group(shared, offset), repeat=repeat)
+            # Comme draw_sprites: pas d'élimination quand tout tient sur un écran
+            batched = time_call(lambda: batch.draw(screen, shared, offset=offset, cull=spread > 1), repeat=repeat)
+            print(f"{n:>8} {spread:>7} {old:>12.2f} {grouped:>13.2f} {batched:>9.2f} {batch.last_drawn:>9}")
+
+
+def bench_waves(sizes=(100, 1000, 5000), repeat=20):
+    """Arrivée d'une vague: ennemis construits un par un avec tirages inline (ancien spawn)
+    contre vague planifiée d'avance et ennemis pris dans la réserve pré-remplie."""
+    from headless import make_world
+    from director import WaveDirector
+    from enemy import Enemy
+
+    print(f"{'vague':>8} {'construits ms':>14} {'réserve ms':>11} {'créés':>7}")
+    for n in sizes:
+        world = make_world(0, max_enemies=n, director=WaveDirector(base_size=n))
+        wave = world.director.waves[0]
+        rng = world.rng
+
+        def clear(_=None):
+            for enemy in world.enemies.sprites():
+                enemy.kill()
+
+        def construct(_):
+            for _ in range(n):
+                world.enemies.add(Enemy(world.bounds, hp=3, damage=1, rng=rng))
+
+        built = time_call(construct, clear, repeat)
+        created = enemy_pool.created
+        pooled = time_call(lambda _: world.spawn_wave(wave), clear, repeat)
+        clear()
+        print(f"{n:>8} {built:>14.2f} {pooled:>11.2f} {enemy_pool.created - created:>7}")
+
+
+def bench_scale(scales=(1.0, 0.75, 0.5), count=200, repeat=20, window=(800, 600)):
+    """Frame de mission complète (fill, sprites, barres de vie, HUD) dessinée à la résolution
+    interne window * scale puis agrandie vers la fenêtre (même nombre d'ennemis à l'écran)."""
+    from headless import make_world
+    from render import draw_mission
+
+    target = pygame.Surface(window)
+    print(f"{'échelle':>8} {'interne':>10} {'dessin ms':>10} {'agrandir ms':>12} {'total ms':>9}")
+    for scale in scales:
+        size = (round(window[0] * scale), round(window[1] * scale))
+        world = make_world(0, size=size)
+        _keep_running(world)
+        _populate(world, count)
+        surface = target if size == window else pygame.Surface(size)
+        draw = time_call(lambda: draw_mission(surface, world), repeat=repeat)
+        upscale = 0.0
+        if surface is not target:
+            upscale = time_call(lambda: pygame.transform.scale(surface, window, target), repeat=repeat)
+        print(f"{scale:>8.2f} {size[0]:>5}x{size[1]:<4} {draw:>10.2f} {upscale:>12.2f} {draw + upscale:>9.2f}")
+
+
+BENCHMARKS = {
+    "scenarios": bench_scenarios,
+    "separation": bench_separation,
+    "swarm": bench_swarm,
+    "collision": bench_collision,
+    "snapshot": bench_snapshot,
+    "lod": bench_lod,
+    "arena": bench_arena,
+    "batch": bench_batch,
+    "waves": bench_waves,
+    "scale": bench_scale,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks hors écran de Tune Shooter")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark", help=f"parmi {', '.join(BENCHMARKS)} (défaut: scenarios)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="limite aux scénarios donnés")
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="fichier JSON de référence des scénarios (défaut: bench_baseline.json à côté de "
+                             "benchmark.py), créé par --save-baseline")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="enregistre les résultats des scénarios comme baseline au lieu de s'y comparer")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark inconnu: {', '.join(unknown)}")
+
+    regressions = 0
+    for name in args.benchmarks or ["scenarios"]:
+        print(f"== {name} ==")
+        if name == "scenarios":
+            regressions += bench_scenarios(args.scenario, args.ticks, args.baseline, args.save_baseline)
+        else:
+            BENCHMARKS[name]()
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import pygame
 
 class Building:
+    # Incrémenté à chaque changement de niveau: invalide les statistiques dérivées (stats.py)
+    generation = 0
+
     def __init__(self, x, y, name, description, color=(100, 100, 100)):
         self.rect = pygame.Rect(x, y, 80, 80)
         self.name = name
@@ -10,6 +13,15 @@ class Building:
         self.max_level = 10
         self.upgrade_costs = [0, 20, 40, 70, 110, 160, 220, 290, 370, 460]  # Coût pour chaque niveau
 
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, value):
+        self._level = value
+        Building.generation += 1
+
     def get_upgrade_cost(self):
         """Retourne le coût pour upgrader au niveau suivant."""
         if self.level >= self.max_level:
@@ -0,0 +1,97 @@
+from spatial import SpatialHash
+
+
+def sweep_entry(x0, y0, dx, dy, w, h, rect):
+    """Instant t (0..1) où un rect w×h allant de (x0, y0) à (x0+dx, y0+dy) commence à chevaucher rect.
+
+    Même règle que Rect.colliderect (des bords qui se touchent ne comptent pas).
+    Retourne None s'il n'y a pas de chevauchement pendant le déplacement.
+    """
+    t_min, t_max = 0.0, 1.0
+    for start, delta, lo, hi in ((x0, dx, rect.left - w, rect.right), (y0, dy, rect.top - h, rect.bottom)):
+        if delta == 0:
+            if not lo < start < hi:
+                return None
+            continue
+        t0 = (lo - start) / delta
+        t1 = (hi - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_min:
+            t_min = t0
+        if t1 < t_max:
+            t_max = t1
+        if t_min >= t_max:
+            return None
+    return t_min
+
+
+class SweptCollider:
+    """Collisions projectiles/ennemis par balayage du déplacement de chaque projectile.
+
+    Les ennemis sont rangés dans une grille (SpatialHash); chaque projectile ne teste que
+    les ennemis des cellules couvertes par son déplacement du tick (last_topleft -> rect),
+    donc un tir rapide ne peut plus traverser un ennemi entre deux positions.
+    """
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size
+        self.grid = SpatialHash(cell_size or 1)
+        self.last_tests = 0
+
+    def collide(self, projectiles, enemies, dokill=True):
+        """Équivalent de groupcollide(projectiles, enemies, dokill, False).
+
+        Chaque projectile ne touche que le ou les ennemis rencontrés en premier le long
+        de sa trajectoire, puis est tué (le premier impact détruit le projectile).
+        """
+        hits = {}
+        self.last_tests = 0
+        projectiles = projectiles.sprites()
+        if not projectiles or not enemies:
+            return hits
+        grid = self.grid
+        cells = grid.cells
+        cells.clear()
+        # Construction de la grille en une seule passe (taille de cellule = plus grand ennemi)
+        biggest = 1
+        entries = []
+        for enemy in enemies:
+            rect = enemy.rect
+            w, h = rect.size
+            if w > biggest:
+                biggest = w
+            if h > biggest:
+                biggest = h
+            entries.append((rect.centerx, rect.centery, enemy))
+        cs = grid.cell_size = self.cell_size or biggest
+        for x, y, enemy in entries:
+            key = (x // cs, y // cs)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [enemy]
+            else:
+                bucket.append(enemy)
+
+        for proj in projectiles:
+            rect = proj.rect
+            x0, y0 = getattr(proj, 'last_topleft', rect.topleft)
+            dx, dy = rect.x - x0, rect.y - y0
+            w, h = rect.size
+            swept = rect.union((x0, y0, w, h))
+            first_t = None
+            first = []
+            for enemy in grid.query_rect(swept):
+                self.last_tests += 1
+                t = sweep_entry(x0, y0, dx, dy, w, h, enemy.rect)
+                if t is None:
+                    continue
+                if first_t is None or t < first_t:
+                    first_t, first = t, [enemy]
+                elif t == first_t:
+                    first.append(enemy)
+            if first:
+                hits[proj] = first
+                if dokill:
+                    proj.kill()
+        return hits
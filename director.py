@@ -0,0 +1,191 @@
+"""Directeur de vagues: planning des apparitions d'ennemis calculé d'avance.
+
+Au lancement d'une mission, plan() fixe une graine (tirée du générateur du monde), la
+difficulté et le niveau du joueur. Les vagues (heure, type et position de chaque ennemi)
+sont générées d'avance à partir de cette seule graine, au plus une par tick quand le
+planning passe sous WAVE_HORIZON vagues: l'arrivée d'une vague ne fait que prendre des
+ennemis dans les réserves (enemy_pool, ranged_enemy_pool) et les placer.
+
+Le plafond d'ennemis d'un tick vient de TickInput.enemy_cap, calculé hors simulation par
+EnemyCapController à partir du temps de frame mesuré (comme le quota LOD): il descend
+sous le plafond de la mission si les frames dépassent le budget et monte au-dessus tant
+qu'il reste de la marge. Il est enregistré avec les entrées, donc rejoué à l'identique.
+"""
+import math
+import random
+from array import array
+from collections import deque
+
+# --- Planning des vagues ---
+WAVE_INTERVAL_MS = 4000    # une vague toutes les 4 secondes
+WAVE_BASE_SIZE = 2         # ennemis de la première vague après celle du départ
+WAVE_GROWTH = 0.25         # +25% d'ennemis par vague
+WAVE_HORIZON = 8           # vagues générées d'avance
+RANGED_MIN_LEVEL = 3       # ennemis à distance à partir du niveau 3 du joueur
+RANGED_CHANCE = 0.4
+SPAWN_MARGIN = 50          # distance minimale au bord de l'arène
+
+# --- Plafond adaptatif ---
+FRAME_BUDGET_MS = 12.0     # temps de travail visé par frame (sur 16.7 ms à 60 FPS)
+MIN_ENEMY_CAP = 5          # sous le plafond par défaut d'une mission (world.MAX_ENEMIES)
+MAX_CAP_RATIO = 4.0        # jusqu'à 4 fois le plafond de la mission avec de la marge
+CAP_GROWTH = 0.1           # +10% de plafond par frame sous le budget
+
+
+class Wave:
+    """Une vague planifiée: heure d'arrivée, types (0: Enemy, 1: RangedEnemy) et centres."""
+
+    __slots__ = ("time_ms", "kinds", "positions")
+
+    def __init__(self, time_ms, kinds, positions):
+        self.time_ms = time_ms
+        self.kinds = kinds            # bytes, un type par ennemi
+        self.positions = positions    # array('i') x0, y0, x1, y1...
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+class WaveDirector:
+    """Planning des vagues d'une mission, entièrement déterminé par plan()."""
+
+    def __init__(self, interval_ms=WAVE_INTERVAL_MS, base_size=WAVE_BASE_SIZE, growth=WAVE_GROWTH,
+                 horizon=WAVE_HORIZON):
+        self.interval_ms = interval_ms
+        self.base_size = base_size
+        self.growth = growth
+        self.horizon = horizon
+        self.seed = 0
+        self.level = 1
+        self.difficulty = 1.0
+        self.start_ms = 0.0
+        self.first_size = 0
+        self.bounds = None
+        self.rng = random.Random(0)
+        self.waves = deque()
+        self.generated = 0   # vagues générées depuis plan()
+        self.next_wave = 0   # indice de la prochaine vague à arriver
+        # Compteurs
+        self.spawned = 0
+        self.capped = 0      # ennemis non apparus faute de place
+
+    def plan(self, seed, bounds, level, difficulty, start_ms, first_size, next_wave=0):
+        """Prépare le planning d'une mission; next_wave > 0 reprend un planning sauvegardé."""
+        self.seed = seed
+        self.bounds = bounds
+        self.level = level
+        self.difficulty = difficulty
+        self.start_ms = start_ms
+        self.first_size = first_size
+        self.rng = random.Random(seed)
+        self.waves.clear()
+        self.generated = 0
+        # Les vagues déjà passées sont régénérées pour retrouver l'état du générateur
+        while self.generated < next_wave:
+            self._generate()
+        self.waves.clear()
+        self.next_wave = next_wave
+        self.fill(self.horizon)
+
+    def wave_size(self, index):
+        if index == 0:
+            return self.first_size
+        # Taille selon la difficulté générale et le niveau du joueur (+20% par niveau)
+        total_multiplier = self.difficulty * max(1.0, self.level * 0.2)
+        return max(1, int(self.base_size * total_multiplier * (1 + self.growth * (index - 1))))
+
+    def _generate(self):
+        index = self.generated
+        count = self.wave_size(index)
+        rng = self.rng.random
+        ranged = self.level >= RANGED_MIN_LEVEL
+        x0, y0 = self.bounds.left + SPAWN_MARGIN, self.bounds.top + SPAWN_MARGIN
+        span_x = max(1, self.bounds.width - 2 * SPAWN_MARGIN)
+        span_y = max(1, self.bounds.height - 2 * SPAWN_MARGIN)
+        kinds = bytes(1 if ranged and rng() < RANGED_CHANCE else 0 for _ in range(count))
+        positions = array('i', [0]) * (2 * count)
+        for i in range(count):
+            positions[2 * i] = x0 + int(rng() * span_x)
+            positions[2 * i + 1] = y0 + int(rng() * span_y)
+        self.waves.append(Wave(self.start_ms + index * self.interval_ms, kinds, positions))
+        self.generated += 1
+
+    def fill(self, limit=1):
+        """Génère jusqu'à limit vagues si le planning est sous l'horizon."""
+        for _ in range(limit):
+            if len(self.waves) >= self.horizon:
+                return
+            self._generate()
+
+    def peak_sizes(self):
+        """(Enemy, RangedEnemy) les plus nombreux dans une des vagues planifiées."""
+        ranged = max((sum(wave.kinds) for wave in self.waves), default=0)
+        normal = max((len(wave) - sum(wave.kinds) for wave in self.waves), default=0)
+        return normal, ranged
+
+    def due(self, now):
+        """Retire et retourne les vagues arrivées à l'heure now."""
+        arrived = []
+        waves = self.waves
+        while True:
+            if not waves:
+                # Planning épuisé (horizon trop court): on génère à la demande
+                self._generate()
+            if waves[0].time_ms > now:
+                return arrived
+            arrived.append(waves.popleft())
+            self.next_wave += 1
+
+    def report(self):
+        return (f"Vagues: {self.next_wave} arrivées, {self.spawned} ennemis apparus, "
+                f"{self.capped} retenus par le plafond")
+
+
+class EnemyCapController:
+    """Plafond d'ennemis ajusté au temps de frame mesuré (moyenne glissante).
+
+    Au-dessus du budget, le plafond descend vers le nombre d'ennemis qui tient dans le
+    budget (jamais sous min_cap); bien en dessous, il monte de CAP_GROWTH par frame,
+    jusqu'à max_ratio fois le plafond de la mission.
+    """
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, min_cap=MIN_ENEMY_CAP, growth=CAP_GROWTH,
+                 max_ratio=MAX_CAP_RATIO):
+        self.budget_ms = budget_ms
+        self.min_cap = min_cap
+        self.growth = growth
+        self.max_ratio = max_ratio
+        self.frame_ms = None
+        self.cap = None
+        self.lowest = None
+        self.highest = None
+
+    def update(self, frame_ms, enemies, max_enemies):
+        """Retourne le plafond du prochain tick (None: plafond de la mission)."""
+        self.frame_ms = frame_ms if self.frame_ms is None else self.frame_ms * 0.9 + frame_ms * 0.1
+        cap = max_enemies if self.cap is None else self.cap
+        if self.frame_ms > self.budget_ms and enemies > self.min_cap:
+            cap = min(cap, max(self.min_cap, int(enemies * self.budget_ms / self.frame_ms)))
+        elif self.frame_ms < self.budget_ms * 0.8:
+            # Au-dessus du plafond de la mission, on ne monte que s'il est atteint
+            if cap < max_enemies or enemies >= cap:
+                cap = min(int(max_enemies * self.max_ratio), cap + max(1, math.ceil(cap * self.growth)))
+        if cap == max_enemies:
+            self.cap = None
+            return None
+        self.cap = cap
+        if cap < max_enemies:
+            self.lowest = cap if self.lowest is None else min(self.lowest, cap)
+        else:
+            self.highest = cap if self.highest is None else max(self.highest, cap)
+        return cap
+
+    def report(self):
+        if self.lowest is None and self.highest is None:
+            return "Plafond d'ennemis: celui de la mission"
+        parts = []
+        if self.lowest is not None:
+            parts.append(f"descendu à {self.lowest}")
+        if self.highest is not None:
+            parts.append(f"monté à {self.highest}")
+        return f"Plafond d'ennemis: {', '.join(parts)} (temps de frame moyen {self.frame_ms:.1f} ms)"
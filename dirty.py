@@ -0,0 +1,62 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Affichage par rectangles sales: seules les zones qui changent sont envoyées à l'écran.
+
+    Chaque frame: begin() efface les zones dessinées à la frame précédente, l'appelant
+    dessine en ajoutant ses zones à self.rects, puis present() pousse l'union des zones
+    anciennes et nouvelles avec display.update(rects). Si la surface sale dépasse
+    full_threshold de l'écran, on revient à un fill + flip complet (moins cher que
+    des milliers de petits rectangles). output reçoit flip() / update(rects):
+    pygame.display, ou un scaling.ScaledDisplay quand screen est une surface interne.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0), full_threshold=0.4, output=pygame.display):
+        self.screen = screen
+        self.output = output
+        self.background = background
+        self.full_threshold = full_threshold
+        self.screen_area = screen.get_width() * screen.get_height()
+        self.rects = []
+        self.prev_rects = []
+        self.full = True   # la première frame est toujours complète
+        # Compteurs
+        self.frames = 0
+        self.full_frames = 0
+        self.pushed_area = 0
+
+    def invalidate(self):
+        """Force un affichage complet à la prochaine frame (changement d'écran...)."""
+        self.full = True
+
+    def begin(self):
+        self.rects = []
+        if self.full:
+            self.screen.fill(self.background)
+        else:
+            fill = self.screen.fill
+            for rect in self.prev_rects:
+                fill(self.background, rect)
+
+    def present(self):
+        screen_rect = self.screen.get_rect()
+        rects = [r.clip(screen_rect) for r in self.rects]
+        dirty_area = sum(r.width * r.height for r in rects) + sum(r.width * r.height for r in self.prev_rects)
+        self.frames += 1
+        if self.full or dirty_area > self.full_threshold * self.screen_area:
+            self.output.flip()
+            self.full_frames += 1
+            self.pushed_area += self.screen_area
+        else:
+            self.output.update(self.prev_rects + rects)
+            self.pushed_area += dirty_area
+        # La prochaine frame efface d'abord ce qui vient d'être dessiné; si la frame est
+        # très chargée, un fill complet coûte moins que des milliers de petits fills
+        self.full = dirty_area > self.full_threshold * self.screen_area
+        self.prev_rects = rects
+
+    def report(self):
+        avg = self.pushed_area / self.frames / self.screen_area * 100 if self.frames else 0
+        return (f"Rectangles sales: {self.frames} frames, {self.full_frames} complètes, "
+                f"{avg:.1f}% de l'écran envoyé en moyenne")
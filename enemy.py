@@ -1,21 +1,38 @@
 import pygame
 import random
+from assets import assets
+from pool import Pool
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, screen_rect, hp=3, damage=1):
+    pool = None  # réserve d'origine si l'instance vient de enemy_pool
+    # État de l'ordonnanceur LOD (lod.py): ticks dus et période de mise à jour
+    lod_pending = None
+    lod_period = 1
+
+    def __init__(self, screen_rect, hp=3, damage=1, rng=None):
         super().__init__()
-        self.image = pygame.Surface((30, 30))
-        self.image.fill((255, 0, 0))
-        self.rect = self.image.get_rect(center=(random.randint(50, screen_rect.width-50), random.randint(50, screen_rect.height-50)))
+        self.image = assets.solid((30, 30), (255, 0, 0))
+        self.rect = self.image.get_rect()
+        self.reset(screen_rect, hp, damage, rng)
+
+    def reset(self, screen_rect, hp=3, damage=1, rng=None):
+        """Réinitialise un ennemi recyclé (mêmes arguments que le constructeur)."""
+        rng = rng or random
+        self.rect.center = (rng.randint(50, screen_rect.width-50), rng.randint(50, screen_rect.height-50))
         self.speed = 2
         self.screen_rect = screen_rect
         self.hp = hp
+        self.max_hp = hp  # pour la barre de vie
         self.damage = damage
+        self.lod_pending = None
+        self.lod_period = 1
+        self.prev_tick = None  # pas d'interpolation depuis la position d'une vie précédente
     
-    def update(self, target):
+    def update(self, target, steps=1):
         direction = pygame.math.Vector2(target.rect.center) - pygame.math.Vector2(self.rect.center)
         if direction.length() > 0:
-            move = direction.normalize() * self.speed
+            # steps > 1: plusieurs ticks d'un coup (ennemi lointain mis à jour moins souvent)
+            move = direction.normalize() * (self.speed * steps)
             self.rect.x += move.x
             self.rect.y += move.y
         # Empêcher de sortir de l'écran
@@ -25,3 +42,11 @@ class Enemy(pygame.sprite.Sprite):
     def take_damage(self, amount=1):
         self.hp -= amount
         return self.hp <= 0
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
+
+enemy_pool = Pool(Enemy, "enemies")
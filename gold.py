@@ -1,10 +1,26 @@
 import pygame
+from assets import circle_image
+from pool import Pool
 
 class Gold(pygame.sprite.Sprite):
+    pool = None  # réserve d'origine si l'instance vient de gold_pool
+
     def __init__(self, pos, value=5):
         super().__init__()
         size = 8
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 215, 0), (size//2, size//2), size//2)
+        self.image = circle_image(size, (255, 215, 0))
         self.rect = self.image.get_rect(center=pos)
         self.value = value
+
+    def reset(self, pos, value=5):
+        """Réinitialise une pièce recyclée."""
+        self.rect.center = pos
+        self.value = value
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
+
+gold_pool = Pool(Gold, "gold")
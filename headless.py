@@ -0,0 +1,127 @@
+"""Simulation de mission sans affichage, sans limite de FPS et avec une graine fixe.
+
+Usage: python headless.py --seed 42 --ticks 10000 [--check]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import time
+
+import pygame
+
+from world import World, TickInput
+
+WIDTH, HEIGHT = 800, 600
+
+
+def idle_policy(world):
+    """Le joueur ne bouge pas et ne tire pas."""
+    return TickInput()
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def kite_policy(world):
+    """Tire sur l'ennemi le plus proche en le fuyant, et rejoint la zone d'extraction dès qu'elle est active."""
+    px, py = world.player.rect.center
+    shots = []
+    dx = dy = 0
+    nearest = None
+    best = None
+    for enemy in world.enemies:
+        ex, ey = enemy.rect.center
+        d = (ex - px) ** 2 + (ey - py) ** 2
+        if best is None or d < best:
+            best, nearest = d, (ex, ey)
+    if nearest:
+        shots.append(nearest)
+        dx, dy = _sign(px - nearest[0]), _sign(py - nearest[1])
+    if world.extraction_active:
+        tx, ty = world.extraction_rect.center
+        dx, dy = _sign(tx - px), _sign(ty - py)
+    return TickInput(dx, dy, shots)
+
+
+POLICIES = {"idle": idle_policy, "kite": kite_policy}
+
+
+def make_world(seed=0, buildings=None, player_level=1, extractions=0, size=(WIDTH, HEIGHT), **world_kwargs):
+    """Crée un monde prêt à simuler avec le pilote vidéo dummy.
+
+    extractions fixe la difficulté de départ (comme après autant d'extractions réussies);
+    size est la résolution de rendu (interne) pour laquelle le monde est créé.
+    """
+    # Affichage (images converties) et polices seulement: ni son ni timer SDL
+    pygame.display.init()
+    pygame.font.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((WIDTH, HEIGHT))
+    from moto import Moto
+    screen_rect = pygame.Rect((0, 0), size)
+    player = Moto(screen_rect)
+    player.level = player_level
+    world = World(screen_rect, player, seed=seed, **world_kwargs)
+    if buildings is None:
+        from base import BaseZone
+        buildings = BaseZone(*size, player).buildings
+    world.set_extractions(extractions)
+    world.start_mission(buildings)
+    return world
+
+
+def run(world, ticks, policy=idle_policy, stop_on_end=True):
+    """Avance world de ticks ticks aussi vite que possible. Retourne le nombre de ticks joués."""
+    played = 0
+    for _ in range(ticks):
+        state = world.tick(policy(world))
+        played += 1
+        if state != "running" and stop_on_end:
+            break
+    return played
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="kite")
+    parser.add_argument("--check", action="store_true", help="rejoue la même graine et compare les empreintes")
+    parser.add_argument("--lod", action="store_true", help="ennemis mis à jour par niveaux de distance (sans essaim)")
+    parser.add_argument("--arena", metavar="LxH", help="grande arène découpée en chunks, ex. 4000x3000")
+    parser.add_argument("--horde", type=int, metavar="N", help="vagues de horde, jusqu'à N ennemis simultanés")
+    args = parser.parse_args()
+
+    def options():
+        kwargs = {}
+        if args.lod:
+            from lod import UpdateScheduler
+            kwargs.update(swarm=False, lod=UpdateScheduler(budget_ms=None))
+        if args.arena:
+            from arena import ChunkedArena
+            width, height = (int(v) for v in args.arena.lower().split("x"))
+            kwargs["arena"] = ChunkedArena((width, height))
+        if args.horde:
+            from director import WaveDirector
+            kwargs.update(max_enemies=args.horde, director=WaveDirector(base_size=max(1, args.horde // 10)))
+        return kwargs
+
+    world = make_world(args.seed, **options())
+    start = time.perf_counter()
+    played = run(world, args.ticks, POLICIES[args.policy])
+    elapsed = time.perf_counter() - start
+    print(f"{played} ticks en {elapsed:.3f}s ({played / elapsed:.0f} ticks/s), état: {world.state}, "
+          f"empreinte: {world.state_digest():08x}")
+
+    if args.check:
+        again = make_world(args.seed, **options())
+        run(again, args.ticks, POLICIES[args.policy])
+        same = again.state_digest() == world.state_digest()
+        print("déterministe" if same else "DIVERGENCE entre deux exécutions de la même graine")
+        raise SystemExit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import pygame
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+WHITE = (255, 255, 255)
+
+
+class HealthBarRenderer:
+    """Barres de vie des ennemis pré-rendues par niveau de remplissage et dessinées en un seul blits.
+
+    Le ratio est hp / max_hp de chaque ennemi, tronqué à l'un des `levels` niveaux
+    (par défaut un niveau par pixel de largeur, donc sans perte visible).
+    """
+
+    def __init__(self, width=25, height=3, offset_y=8, levels=None, skip_full=False):
+        self.width = width
+        self.height = height
+        self.offset_y = offset_y
+        self.levels = levels or width + 1
+        self.skip_full = skip_full  # ne pas dessiner les barres des ennemis à pleine vie
+        self.images = [self._render_level(level) for level in range(self.levels)]
+
+    def _render_level(self, level):
+        fill = round(self.width * level / (self.levels - 1))
+        image = pygame.Surface((self.width, self.height))
+        image.fill(RED)
+        image.fill(GREEN, (0, 0, fill, self.height))
+        pygame.draw.rect(image, WHITE, image.get_rect(), 1)
+        return image
+
+    def draw(self, screen, enemies, positions=None, rects=None):
+        """Dessine les barres de tous les ennemis; positions(enemy) donne le coin haut-gauche affiché."""
+        last = self.levels - 1
+        half = self.width // 2
+        blits = []
+        for enemy in enemies:
+            max_hp = getattr(enemy, 'max_hp', None) or enemy.hp
+            ratio = min(1.0, max(0.0, enemy.hp / max_hp)) if max_hp > 0 else 0.0
+            level = int(ratio * last)
+            if level == last and self.skip_full:
+                continue
+            x, y = positions(enemy) if positions else enemy.rect.topleft
+            blits.append((self.images[level], (x + enemy.rect.width // 2 - half, y - self.offset_y)))
+        if rects is None:
+            screen.blits(blits, doreturn=False)
+        else:
+            rects.extend(screen.blits(blits))
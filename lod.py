@@ -0,0 +1,111 @@
+import time
+
+# Niveaux de détail: (distance max au joueur, un update tous les n ticks)
+LOD_TIERS = ((200, 1), (400, 2), (float("inf"), 4))
+LOD_MAX_STEPS = 8         # un ennemi en retard ne rattrape pas plus de 8 pas d'un coup
+LOD_BUDGET_MS = 1.0       # temps par tick accordé aux ennemis lointains
+
+
+class UpdateScheduler:
+    """Met à jour les ennemis proches à chaque tick et les lointains moins souvent.
+
+    Chaque ennemi compte les ticks qui lui sont dus (sprite.lod_pending); il est mis à
+    jour quand ce compte atteint la période de son niveau (sprite.lod_period, recalculée
+    à l'échéance), avec un pas multiplié d'autant (update(target, steps=n)). Les comptes
+    de départ sont décalés pour répartir les ennemis lointains sur les ticks (round-robin).
+
+    quota limite le nombre d'updates lointains d'un tick; les ennemis non servis gardent
+    leur retard et passent en premier au tick suivant. suggest_quota() le calcule à partir
+    du budget de temps; c'est une entrée du tick (TickInput.lod_quota), pas un état interne,
+    pour que la simulation reste reproductible au rejeu.
+    """
+
+    def __init__(self, tiers=LOD_TIERS, budget_ms=LOD_BUDGET_MS, max_steps=LOD_MAX_STEPS):
+        self.tiers = [(distance * distance, period) for distance, period in tiers]
+        self.stagger = max(period for _, period in tiers)
+        self.budget_ms = budget_ms
+        self.max_steps = max_steps
+        self.far_update_ms = None  # coût moyen d'un update lointain (moyenne glissante)
+        self.last_far_due = 0
+        # Compteurs du dernier tick et cumulés
+        self.last_full = 0
+        self.last_far = 0
+        self.last_saved = 0
+        self.last_postponed = 0
+        self.ticks = 0
+        self.total_updates = 0
+        self.total_saved = 0
+        self.total_postponed = 0
+
+    def period_for(self, distance2):
+        for limit, period in self.tiers:
+            if distance2 <= limit:
+                return period
+        return self.tiers[-1][1]
+
+    def update(self, group, target, quota=None):
+        tx, ty = target.rect.center
+        stagger = self.stagger
+        max_steps = self.max_steps
+        full = saved = 0
+        due_far = []
+        for k, sprite in enumerate(group):
+            pending = sprite.lod_pending
+            if pending is None:
+                pending = k % stagger
+            pending += 1
+            # Le niveau n'est réévalué que quand l'ennemi arrive à échéance
+            if pending < sprite.lod_period:
+                sprite.lod_pending = pending
+                saved += 1
+                continue
+            x, y = sprite.rect.center
+            period = self.period_for((x - tx) ** 2 + (y - ty) ** 2)
+            sprite.lod_period = period
+            sprite.lod_pending = pending
+            if period == 1:
+                sprite.update(target, steps=min(pending, max_steps))
+                sprite.lod_pending = 0
+                full += 1
+            elif pending >= period:
+                due_far.append(sprite)
+            else:
+                saved += 1
+
+        # Ennemis lointains: les plus en retard d'abord, dans la limite du quota
+        postponed = 0
+        if quota is not None and len(due_far) > quota:
+            due_far.sort(key=lambda s: s.lod_pending, reverse=True)
+            postponed = len(due_far) - quota
+            del due_far[quota:]
+        start = time.perf_counter()
+        for sprite in due_far:
+            sprite.update(target, steps=min(sprite.lod_pending, max_steps))
+            sprite.lod_pending = 0
+        if due_far:
+            cost = (time.perf_counter() - start) * 1000 / len(due_far)
+            self.far_update_ms = cost if self.far_update_ms is None else self.far_update_ms * 0.9 + cost * 0.1
+        self.last_far_due = len(due_far) + postponed
+
+        self.last_full = full
+        self.last_far = len(due_far)
+        self.last_saved = saved + postponed
+        self.last_postponed = postponed
+        self.ticks += 1
+        self.total_updates += full + len(due_far)
+        self.total_saved += saved + postponed
+        self.total_postponed += postponed
+
+    def suggest_quota(self):
+        """Nombre d'updates lointains qui tiennent dans budget_ms (None: pas de limite)."""
+        if self.budget_ms is None or not self.far_update_ms:
+            return None
+        fits = int(self.budget_ms / self.far_update_ms)
+        return None if fits >= self.last_far_due else fits
+
+    def report(self):
+        ticks = self.ticks or 1
+        total = self.total_updates + self.total_saved
+        rate = (self.total_saved / total * 100) if total else 0
+        return (f"LOD: {self.total_updates / ticks:.1f} updates/tick, {self.total_saved / ticks:.1f} évités/tick "
+                f"({rate:.1f}%), {self.total_postponed} reportés par le budget")
@@ -1,74 +1,111 @@
+import contextlib
+import time
+
 import pygame
-import random
+
+from scaling import ScaledDisplay
 
 pygame.init()
 
 # --- Configuration ---
-WIDTH, HEIGHT = 800, 600
+# Résolution interne: avec RENDER_SCALE < 1, menus, village et mission sont dessinés sur
+# une surface plus petite que la fenêtre, agrandie une fois par frame (postes peu puissants)
+WINDOW_SIZE = (800, 600)
+RENDER_SCALE = 1.0
+SDL_SCALED = False   # agrandissement par SDL (pygame.SCALED) plutôt que transform.scale
+WIDTH, HEIGHT = round(WINDOW_SIZE[0] * RENDER_SCALE), round(WINDOW_SIZE[1] * RENDER_SCALE)
 FPS = 60
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+output = ScaledDisplay(WINDOW_SIZE, (WIDTH, HEIGHT), sdl_scaled=SDL_SCALED)
+screen = output.surface
 pygame.display.set_caption("Tune Shooter")
 clock = pygame.time.Clock()
 
-# --- Couleurs ---
-BLACK = (0, 0, 0)
-BLUE = (0, 0, 255)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-
-from player import Player
-from enemy import Enemy
-from entity import separate_sprites
-
-from projectile import Projectile
-from gold import Gold
-from ranged_enemy import RangedEnemy
-from moto import Moto
+from assets import assets
+from player import read_direction
+from moto import Moto, MOTO_IMAGE, MOTO_SIZE
 from menu import MainMenu
 from base import BaseZone
+from text_cache import text_cache
+from projectile import projectile_pool
+from gold import gold_pool
+from world import World, TickInput
+from render import draw_mission, HUD_FONT
+from profiler import FrameProfiler, OVERLAY_FONT
+from timestep import FixedTimestep
+from dirty import DirtyRectRenderer
+from lod import UpdateScheduler
+from arena import ChunkedArena
+from director import EnemyCapController
+from enemy import enemy_pool
+from ranged_enemy import ranged_enemy_pool
+import snapshot
+from replay import InputRecorder
+from telemetry import Telemetry, TELEMETRY_PATH
+from simthread import SimulationThread
+from swarm import HAVE_NUMPY
 
 # --- Création ---
+# Images chargées, converties et redimensionnées une seule fois au démarrage
+assets.preload([(MOTO_IMAGE, MOTO_SIZE)])
+print(assets.report())
 screen_rect = screen.get_rect()
 player = Moto(screen_rect)
-# Système de difficulté progressive (doit être avant spawn_enemy)
-difficulty_multiplier = 1.0  # augmente avec chaque extraction
-extractions_count = 0
+# Toute la simulation de mission (ennemis, projectiles, or, extraction, progression)
+# Ennemis lointains mis à jour moins souvent, dans un budget de temps par tick; seulement
+# sans numpy: le mode essaim met déjà tous les ennemis à jour en une passe vectorisée.
+# LOD_UPDATES = True demande le mode essaim coupé: le World est alors créé avec swarm=False
+LOD_UPDATES = not HAVE_NUMPY
+# Grande arène défilante (ex. (4000, 3000)), découpée en chunks streamés autour de la caméra;
+# None garde l'arène de la taille de l'écran
+ARENA_SIZE = None
+# Événements de jeu écrits en JSONL par un thread d'arrière-plan (None: désactivé)
+telemetry = Telemetry(TELEMETRY_PATH)
+world = World(screen_rect, player, swarm=HAVE_NUMPY and not LOD_UPDATES, telemetry=telemetry,
+              lod=UpdateScheduler() if LOD_UPDATES else None,
+              arena=ChunkedArena(ARENA_SIZE) if ARENA_SIZE else None)
 
-def spawn_enemy():
-    global difficulty_multiplier
-    # Calcul de la difficulté basée sur le niveau du joueur ET la difficulté générale
-    player_level_multiplier = max(1.0, player.level * 0.2)  # +20% par niveau
-    total_multiplier = difficulty_multiplier * player_level_multiplier
-    
-    base_hp = max(3, int(3 * total_multiplier))
-    base_damage = max(1, int(1 * total_multiplier))
-    
-    # Spawner RangedEnemy à partir du niveau 3 du joueur
-    if player.level >= 3 and random.random() < 0.4:  # 40% chance à partir du niveau 3
-        ranged_hp = max(2, int(2 * total_multiplier))
-        return RangedEnemy(screen_rect, hp=ranged_hp, damage=base_damage)
-    else:
-        return Enemy(screen_rect, hp=base_hp, damage=base_damage)
+# Polices du HUD et du profileur, chargées une seule fois au démarrage
+text_cache.preload(HUD_FONT, OVERLAY_FONT)
 
-enemies = pygame.sprite.Group([spawn_enemy() for _ in range(5)])
-# Spawn continu d'ennemis
-ENEMY_SPAWN_INTERVAL_MS = 2000  # spawn un ennemi tous les 2 secondes
-MAX_ENEMIES = 10                 # max d'ennemis simultanés
-last_enemy_spawn = pygame.time.get_ticks()
-EXTRACT_SIZE = 80
-EXTRACT_DELAY_MS = 5000      # délai entre apparitions (ms)
-EXTRACT_DURATION_MS = 5000   # durée active (ms)
-extraction_rect = pygame.Rect(0, 0, EXTRACT_SIZE, EXTRACT_SIZE)
-extraction_active = False
-extraction_next_spawn = pygame.time.get_ticks() + EXTRACT_DELAY_MS
-extraction_end_time = 0
-projectiles = pygame.sprite.Group()
-golds = pygame.sprite.Group()
-banked_gold = 0
-banked_xp = 0
-enemy_projectiles = pygame.sprite.Group()  # Projectiles tirés par les ennemis
-gold_multiplier = 1.0  # Multiplicateur d'or selon le Marché
-xp_multiplier = 1.0    # Multiplicateur d'XP selon la Bibliothèque
+# Profileur par phase: F3 affiche/masque l'overlay, F4 exporte le tampon en CSV
+profiler = FrameProfiler()
+PROFILE_CSV = "profile.csv"
+
+
+def handle_profiler_key(event):
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+        profiler.toggle_overlay()
+    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+        print(f"Profil exporté dans {profiler.export_csv(PROFILE_CSV)}")
+
+# Sauvegarde rapide: F5 sauvegarde la partie, F9 la recharge (aussi depuis les menus);
+# un plantage pendant une mission écrit une sauvegarde de secours
+QUICKSAVE_PATH = "quicksave.bin"
+AUTOSAVE_PATH = "autosave.bin"
+
+
+def handle_snapshot_key(event):
+    """Retourne True si une sauvegarde vient d'être rechargée."""
+    if event.type != pygame.KEYDOWN:
+        return False
+    if event.key == pygame.K_F5:
+        try:
+            size = snapshot.save(QUICKSAVE_PATH, world, base_zone.buildings)
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f"Sauvegarde impossible: {e}")
+            return False
+        print(f"Partie sauvegardée dans {QUICKSAVE_PATH} ({size} octets)")
+    elif event.key == pygame.K_F9:
+        try:
+            snapshot.load(QUICKSAVE_PATH, world, base_zone.buildings)
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f"Chargement impossible: {e}")
+            return False
+        # Les niveaux des bâtiments ont pu changer: le village sera redessiné
+        base_zone.invalidate_world()
+        print(f"Partie rechargée depuis {QUICKSAVE_PATH}")
+        return True
+    return False
 
 # --- Menus principaux ---
 main_menu = MainMenu(WIDTH, HEIGHT)
@@ -77,242 +114,226 @@ base_zone = BaseZone(WIDTH, HEIGHT, player)
 # État du jeu
 game_state = "main_menu"  # main_menu, base, game, settings
 
-# Boucle des menus
+# Boucle des menus: l'écran n'est redessiné que si quelque chose change (survol,
+# déplacement, message, clic); sinon on dort dans pygame.event.wait
+IDLE_WAKEUP_MS = 1000  # réveil de sécurité quand rien ne se passe
+needs_redraw = True
+message_shown = False
+active = False
 while game_state != "quit" and game_state != "game":
-    clock.tick(FPS)
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            raise SystemExit
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if game_state == "main_menu":
-                action = main_menu.handle_click(event.pos)
-                if action == "play":
-                    game_state = "base"
-                elif action == "quit":
-                    pygame.quit()
-                    raise SystemExit
-            elif game_state == "base":
-                action = base_zone.handle_click(event.pos)
-                if action == "launch":
-                    # Appliquer les bonus des bâtiments avant de lancer la mission
-                    player.apply_upgrade_bonuses(base_zone.buildings)
-                    
-                    # Mettre à jour les multiplicateurs selon les bâtiments
-                    gold_multiplier = 1.0
-                    xp_multiplier = 1.0
-                    for building in base_zone.buildings:
-                        if building.name == "Marché" and building.level > 0:
-                            gold_multiplier += building.level * 0.1  # +10% d'or par niveau
-                        elif building.name == "Bibliothèque" and building.level > 0:
-                            xp_multiplier += building.level * 0.1  # +10% d'XP par niveau
-                    
-                    # Réinitialiser les sprites et les groupes pour la nouvelle mission
-                    enemies.empty()
-                    projectiles.empty()
-                    enemy_projectiles.empty()
-                    golds.empty()
-                    enemies.add([spawn_enemy() for _ in range(5)])
-                    extraction_active = False
-                    extraction_next_spawn = pygame.time.get_ticks() + EXTRACT_DELAY_MS
-                    game_state = "game"
-                elif action == "menu":
-                    game_state = "main_menu"
-                elif isinstance(action, tuple) and action[0] == "building":
-                    building = action[1]
-                    cost = base_zone.upgrade_building(building, banked_gold)
-                    if cost > 0:
-                        banked_gold -= cost
+    if active:
+        # Déplacement en cours (ou overlay du profileur affiché): 60 FPS
+        clock.tick(FPS)
+        events = pygame.event.get()
+    else:
+        timeout = IDLE_WAKEUP_MS
+        if game_state == "base" and base_zone.message_time_left() is not None:
+            timeout = min(timeout, base_zone.message_time_left() + 1)
+        first = pygame.event.wait(timeout)
+        events = ([first] if first.type != pygame.NOEVENT else []) + pygame.event.get()
+        clock.tick()
+    profiler.begin_frame()
     
-    # Mettre à jour la base zone (déplacement)
-    if game_state == "base":
-        base_zone.update()
+    with profiler.section("events"):
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                raise SystemExit
+            handle_profiler_key(event)
+            if handle_snapshot_key(event) and world.state == "running":
+                # Reprise directe de la mission sauvegardée
+                game_state = "game"
+            if event.type != pygame.MOUSEMOTION:
+                # Clic, touche, fenêtre exposée...: on redessine
+                needs_redraw = True
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if game_state == "main_menu":
+                    action = main_menu.handle_click(output.to_render(event.pos))
+                    if action == "play":
+                        game_state = "base"
+                    elif action == "quit":
+                        pygame.quit()
+                        raise SystemExit
+                elif game_state == "base":
+                    action = base_zone.handle_click(output.to_render(event.pos))
+                    if action == "launch":
+                        # Appliquer les bonus des bâtiments et préparer la mission
+                        world.start_mission(base_zone.buildings)
+                        game_state = "game"
+                    elif action == "menu":
+                        game_state = "main_menu"
+                    elif isinstance(action, tuple) and action[0] == "building":
+                        building = action[1]
+                        cost = base_zone.upgrade_building(building, world.banked_gold)
+                        if cost > 0:
+                            world.banked_gold -= cost
     
+    # Mettre à jour la base zone (déplacement) et le survol des boutons
+    # Souris ramenée à la résolution interne (clics, survol et tirs)
+    mouse_pos = output.mouse_pos()
     if game_state == "main_menu":
-        main_menu.draw(screen)
+        needs_redraw |= main_menu.update_hover(mouse_pos)
     elif game_state == "base":
-        base_zone.draw(screen)
+        with profiler.section("base_update"):
+            needs_redraw |= base_zone.update()
+            needs_redraw |= base_zone.update_hover(mouse_pos)
+            # Apparition ou disparition du message temporaire
+            if base_zone.message_visible() != message_shown:
+                message_shown = not message_shown
+                needs_redraw = True
+    active = profiler.show_overlay or (game_state == "base" and read_direction() != (0, 0))
     
-    pygame.display.flip()
+    if not (needs_redraw or profiler.show_overlay) or game_state == "game":
+        # Frame sans redessin: ses événements et sa mise à jour restent dans le profil
+        profiler.end_frame()
+        continue
+    needs_redraw = False
+    with profiler.section("draw"):
+        if game_state == "main_menu":
+            main_menu.draw(screen)
+        elif game_state == "base":
+            base_zone.draw(screen)
+    with profiler.section("overlay"):
+        profiler.draw_overlay(screen)
+    
+    with profiler.section("flip"):
+        output.flip()
+    profiler.end_frame()
 
 # --- Boucle principale ---
+# Simulation à pas fixe découplée de l'affichage: une frame lente rattrape
+# jusqu'à MAX_CATCHUP_TICKS ticks au lieu de ralentir le jeu
+MAX_CATCHUP_TICKS = 5
+timestep = FixedTimestep(max_catchup=MAX_CATCHUP_TICKS)
+world.track_previous = True
+# Rendu par rectangles sales: seules les zones modifiées sont envoyées à l'écran
+DIRTY_RECTS = True
+dirty = DirtyRectRenderer(screen, output=output) if DIRTY_RECTS else None
+# Enregistrement des entrées de la mission, rejouable avec: python replay.py last_mission.rec
+RECORD_MISSIONS = True
+RECORD_PATH = "last_mission.rec"
+recorder = InputRecorder(RECORD_PATH, world, base_zone.buildings) if RECORD_MISSIONS else None
+# Plafond d'ennemis abaissé si le temps de travail par frame dépasse le budget
+ADAPTIVE_ENEMY_CAP = True
+cap_controller = EnemyCapController() if ADAPTIVE_ENEMY_CAP else None
+# Simulation sur un thread à part: l'affichage dessine le dernier snapshot publié à la
+# cadence de l'écran, sans attendre les ticks (mesures de latence et de chevauchement)
+SIMULATION_THREAD = False
+sim_thread = (SimulationThread(world, recorder.tick if recorder else None, cap_controller, MAX_CATCHUP_TICKS)
+              if SIMULATION_THREAD else None)
+# Sauvegarde et rechargement attendent la fin du tick en cours
+world_lock = sim_thread.lock if sim_thread else contextlib.nullcontext()
+pending_shots = []
 running = True
-while running:
-    clock.tick(FPS)
-    now = pygame.time.get_ticks()
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        # Tir: espace ou clic gauche
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-            proj = player.shoot(pygame.mouse.get_pos(), now)
-            if proj:
-                projectiles.add(proj)
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            proj = player.shoot(event.pos, now)
-            if proj:
-                projectiles.add(proj)
+try:
+    if sim_thread:
+        sim_thread.start()
+    while running:
+        frame_ms = clock.tick(FPS)
+        frame_start, frame_cpu = time.perf_counter(), time.thread_time()
+        profiler.begin_frame()
+        # Le snapshot est gardé pour toute la frame (tirs et affichage avec la même caméra)
+        view = sim_thread.latest() if sim_thread else world
     
-    # Mise à jour
-    player.update()
-    enemies.update(player)
-    projectiles.update()
-    enemy_projectiles.update()
+        # Entrées du tick: déplacement au clavier et tirs (espace ou clic gauche)
+        with profiler.section("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                handle_profiler_key(event)
+                with world_lock:
+                    restored = handle_snapshot_key(event)
+                    if restored and recorder:
+                        recorder.restored()
+                if restored and dirty:
+                    dirty.invalidate()
+                # Les cibles sont converties en coordonnées de l'arène (caméra)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    pending_shots.append(view.screen_to_world(output.mouse_pos()))
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    pending_shots.append(view.screen_to_world(output.to_render(event.pos)))
+            dx, dy = read_direction()
     
-    # Les ennemis à distance tirent
-    for enemy in enemies:
-        if isinstance(enemy, RangedEnemy):
-            proj = enemy.shoot(player, now)
-            if proj:
-                enemy_projectiles.add(proj)
+        if sim_thread:
+            # Les ticks tournent sur le thread de simulation: on lui livre les entrées
+            sim_thread.check()
+            sim_thread.post_input(dx, dy, pending_shots)
+            pending_shots = []
+            if sim_thread.finished:
+                running = False
+            alpha = sim_thread.alpha(view)
+        else:
+            # Mise à jour de la simulation (collisions, spawn, extraction...)
+            # Les tirs sont livrés au premier tick joué (gardés si la frame n'en joue aucun)
+            # get_rawtime: temps de travail de la frame précédente, sans l'attente de clock.tick
+            enemy_cap = cap_controller.update(clock.get_rawtime(), world.enemy_count(), world.max_enemies) if cap_controller else None
+            for _ in range(timestep.advance(frame_ms)):
+                inp = TickInput(dx, dy, pending_shots, world.lod.suggest_quota() if world.lod else None, enemy_cap)
+                state = recorder.tick(inp, on_phase=profiler.record) if recorder else world.tick(inp, on_phase=profiler.record)
+                pending_shots = []
+                if state != "running":
+                    running = False
+                    break
+            alpha = timestep.alpha
     
-    # Détection des collisions (hitbox)
-    # Vérifier les collisions avant séparation pour appliquer les dégâts
-    hits = pygame.sprite.spritecollide(player, enemies, False)
-    if hits:
-        damage_taken = sum(getattr(e, 'damage', 1) for e in hits)
-        player.hp -= damage_taken
-        print(f"HP: {player.hp}")
-        if player.hp <= 0:
-            # Bank XP on death (no gold)
-            banked_xp += getattr(player, 'xp', 0)
-            print("Game Over!")
-            print(f"Banked XP total: {banked_xp}")
-            running = False
+        # Affichage, interpolé entre les deux derniers états simulés
+        if dirty:
+            with profiler.section("clear"):
+                dirty.begin()
+            draw_mission(screen, view, on_phase=profiler.record, alpha=alpha, rects=dirty.rects, clear=False)
+        else:
+            draw_mission(screen, view, on_phase=profiler.record, alpha=alpha)
+        with profiler.section("overlay"):
+            panel = profiler.draw_overlay(screen)
+            if dirty and panel:
+                dirty.rects.append(panel)
     
-    # Collisions avec les projectiles ennemis
-    enemy_proj_hits = pygame.sprite.spritecollide(player, enemy_projectiles, True)
-    if enemy_proj_hits:
-        damage_taken = sum(getattr(p, 'damage', 1) for p in enemy_proj_hits)
-        player.hp -= damage_taken
-        print(f"Hit by enemy projectile! HP: {player.hp}")
-
-    # Résolution des collisions entre ennemis (ne doivent pas se chevaucher)
-    enemy_list = list(enemies)
-    for i in range(len(enemy_list)):
-        for j in range(i + 1, len(enemy_list)):
-            separate_sprites(enemy_list[i], enemy_list[j], push_a=True, push_b=True)
-
-    # Empêcher les ennemis d'entrer dans le joueur: on pousse seulement l'ennemi
-    for enemy in enemies:
-        separate_sprites(player, enemy, push_a=False, push_b=True)
-
-    # Projectiles qui touchent des ennemis
-    proj_hits = pygame.sprite.groupcollide(projectiles, enemies, True, False)
-    if proj_hits:
-        for proj, hit_enemies in proj_hits.items():
-            for enemy in hit_enemies:
-                dmg = getattr(proj, 'damage', 1)
-                died = enemy.take_damage(dmg)
-                if died:
-                    # spawn gold, remove enemy (no automatic respawn on kill)
-                    xp_reward = int(10 * difficulty_multiplier * xp_multiplier)
-                    gold_value = int(5 * difficulty_multiplier * gold_multiplier)
-                    g = Gold(enemy.rect.center, value=gold_value)
-                    golds.add(g)
-                    enemy.kill()
-                    # award XP to player for the kill
-                    if hasattr(player, 'add_xp'):
-                        player.add_xp(xp_reward)
-
-    # Player collecte l'or
-    collected = pygame.sprite.spritecollide(player, golds, True)
-    if collected:
-        for g in collected:
-            player.gold += int(g.value * gold_multiplier)
-        print(f"Gold: {player.gold}")
-
-    # Spawn continu des ennemis (indépendant des kills)
-    if now - last_enemy_spawn >= ENEMY_SPAWN_INTERVAL_MS and len(enemies) < MAX_ENEMIES:
-        enemies.add(spawn_enemy())
-        last_enemy_spawn = now
+        with profiler.section("flip"):
+            if dirty:
+                dirty.present()
+            else:
+                output.flip()
+        if sim_thread:
+            sim_thread.presented(view, frame_start, frame_cpu)
+        profiler.end_frame()
+except Exception:
+    # Plantage: on garde la mission (renommer le fichier en quicksave.bin puis F9 pour la reprendre)
+    if sim_thread:
+        sim_thread.stop()
+    try:
+        snapshot.save(AUTOSAVE_PATH, world, base_zone.buildings)
+        print(f"Sauvegarde de secours écrite dans {AUTOSAVE_PATH}")
+    except Exception as e:
+        print(f"Sauvegarde de secours impossible: {e}")
+    raise
+finally:
+    if sim_thread:
+        sim_thread.stop()
+    if recorder:
+        recorder.close()
+    if telemetry:
+        telemetry.close()
 
-    # Gestion temporaire de la zone d'extraction (apparitions périodiques)
-    if not extraction_active and now >= extraction_next_spawn:
-        extraction_active = True
-        # Place the extraction zone at a random location within the screen bounds (with margin)
-        margin = 10
-        x = random.randint(margin, screen_rect.width - EXTRACT_SIZE - margin)
-        y = random.randint(margin, screen_rect.height - EXTRACT_SIZE - margin)
-        extraction_rect.topleft = (x, y)
-        extraction_end_time = now + EXTRACT_DURATION_MS
-    if extraction_active and now >= extraction_end_time:
-        extraction_active = False
-        extraction_next_spawn = now + EXTRACT_DELAY_MS
-
-    # Extraction: si la zone est active et le joueur y entre, fin de la partie
-    if extraction_active and player.rect.colliderect(extraction_rect):
-        # Bank the gold and XP on successful extraction
-        banked_gold += player.gold
-        # bank XP as well
-        banked_xp += getattr(player, 'xp', 0)
-        player.gold = 0
-        player.xp = 0
-        # Heal player fully on extraction
-        if hasattr(player, 'heal_full'):
-            player.heal_full()
-        # Increase difficulty
-        extractions_count += 1
-        difficulty_multiplier = 1.0 + (extractions_count * 0.25)  # +25% per extraction
-        print(f"Extraction reached. Banked gold total: {banked_gold}, Banked XP total: {banked_xp}")
-        print(f"Difficulty increased to {difficulty_multiplier:.2f}x")
-        
-        # Retour au village pour les améliorations
-        running = False
-        # Réinitialiser le joueur pour la prochaine mission, mais garder le niveau et XP banké
-        player_level_backup = player.level
-        player.reset()
-        player.level = player_level_backup
-        # Réinitialiser aussi le statut du joueur
-    
-    # Affichage
-    screen.fill(BLACK)
-    screen.blit(player.image, player.rect)
-    enemies.draw(screen)
-    # Dessiner les barres de vie des ennemis
-    for enemy in enemies:
-        hp_ratio = max(0, enemy.hp / 3) if enemy.hp <= 3 else enemy.hp / max(enemy.hp, 1)
-        bar_width = 25
-        bar_height = 3
-        bar_x = enemy.rect.centerx - bar_width // 2
-        bar_y = enemy.rect.top - 8
-        pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, int(bar_width * hp_ratio), bar_height))
-        pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 1)
-    projectiles.draw(screen)
-    enemy_projectiles.draw(screen)
-    golds.draw(screen)
-    # Dessiner la zone d'extraction si active
-    if extraction_active:
-        pygame.draw.rect(screen, BLUE, extraction_rect)
-        pygame.draw.rect(screen, (255,255,255), extraction_rect, 2)
-    
-    # Affichage des barres de HP et XP (en bas au centre)
-    bar_width = 300
-    bar_height = 20
-    bar_x = WIDTH // 2 - bar_width // 2
-    bar_y_hp = HEIGHT - 80
-    bar_y_xp = HEIGHT - 40
-    
-    # Barre de HP
-    hp_ratio = max(0, player.hp / player.max_hp)
-    pygame.draw.rect(screen, RED, (bar_x, bar_y_hp, bar_width, bar_height))
-    pygame.draw.rect(screen, GREEN, (bar_x, bar_y_hp, int(bar_width * hp_ratio), bar_height))
-    pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y_hp, bar_width, bar_height), 2)
-    hp_text = pygame.font.SysFont(None, 16).render(f"HP: {player.hp}/{player.max_hp}", True, (255, 255, 255))
-    screen.blit(hp_text, (bar_x + 5, bar_y_hp + 2))
-    
-    # Barre d'XP
-    xp_for_next_level = player.level * 100
-    xp_ratio = min(1, player.xp / xp_for_next_level) if xp_for_next_level > 0 else 0
-    pygame.draw.rect(screen, (100, 100, 100), (bar_x, bar_y_xp, bar_width, bar_height))
-    pygame.draw.rect(screen, (200, 200, 255), (bar_x, bar_y_xp, int(bar_width * xp_ratio), bar_height))
-    pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y_xp, bar_width, bar_height), 2)
-    xp_text = pygame.font.SysFont(None, 16).render(f"XP: {player.xp}/{xp_for_next_level} (Lvl {player.level})", True, (255, 255, 255))
-    screen.blit(xp_text, (bar_x + 5, bar_y_xp + 2))
-    
-    pygame.display.flip()
+# Occupation des réserves, pour dimensionner les builds à tir rapide
+for pool in (projectile_pool, gold_pool, enemy_pool, ranged_enemy_pool):
+    print(pool.report())
+print(world.director.report())
+if cap_controller:
+    print(cap_controller.report())
+print(text_cache.report())
+print(output.report())
+print((sim_thread.timestep if sim_thread else timestep).report())
+if sim_thread:
+    print(sim_thread.report())
+if dirty:
+    print(dirty.report())
+if recorder:
+    print(recorder.report())
+if world.lod and world.lod.ticks:
+    print(world.lod.report())
+if world.arena:
+    print(world.arena.report())
+if telemetry:
+    print(telemetry.report())
 
 pygame.quit()
\ No newline at end of file
@@ -1,12 +1,15 @@
 import pygame
+from text_cache import text_cache
 
 class MainMenu:
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.font_title = pygame.font.SysFont(None, 72)
-        self.font_btn = pygame.font.SysFont(None, 36)
-        self.font_small = pygame.font.SysFont(None, 24)
+        # Polices chargées une seule fois par le cache de texte (on garde leur spec)
+        self.font_title = (None, 72)
+        self.font_btn = (None, 36)
+        self.font_small = (None, 24)
+        text_cache.preload(self.font_title, self.font_btn, self.font_small)
         
         # Boutons
         self.play_btn = pygame.Rect(self.width // 2 - 100, self.height // 2 - 50, 200, 60)
@@ -19,7 +22,7 @@ class MainMenu:
         screen.fill((20, 20, 30))
         
         # Titre
-        title = self.font_title.render("Vampire Survivor", True, (255, 100, 100))
+        title = text_cache.render(self.font_title, "Vampire Survivor", True, (255, 100, 100))
         screen.blit(title, (self.width // 2 - title.get_width() // 2, 50))
         
         # Boutons
@@ -29,15 +32,25 @@ class MainMenu:
             (self.quit_btn, "QUIT", (150, 0, 0))
         ]
         
-        mouse_pos = pygame.mouse.get_pos()
+        # Survol mis à jour par update_hover (position déjà ramenée à la résolution interne)
         for btn, label, color in buttons:
-            hover = btn.collidepoint(mouse_pos)
+            hover = btn is self.hovered
             btn_color = tuple(min(255, c + 50) for c in color) if hover else color
             pygame.draw.rect(screen, btn_color, btn)
             pygame.draw.rect(screen, (255, 255, 255), btn, 2)
-            text = self.font_btn.render(label, True, (255, 255, 255))
+            text = text_cache.render(self.font_btn, label, True, (255, 255, 255))
             screen.blit(text, (btn.x + btn.width // 2 - text.get_width() // 2, btn.y + btn.height // 2 - text.get_height() // 2))
 
+    def update_hover(self, mouse_pos):
+        """Met à jour le bouton survolé. Retourne True s'il a changé."""
+        hovered = None
+        for btn in (self.play_btn, self.settings_btn, self.quit_btn):
+            if btn.collidepoint(mouse_pos):
+                hovered = btn
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
+
     def handle_click(self, pos):
         if self.play_btn.collidepoint(pos):
             return "play"
@@ -0,0 +1,65 @@
+class Pool:
+    """Réserve d'objets réutilisables (projectiles, or...) pour éviter les allocations en boucle.
+
+    factory(*args, **kwargs) crée un nouvel objet quand la réserve est vide;
+    sinon un objet libre est réinitialisé avec obj.reset(*args, **kwargs).
+    """
+
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name = name or getattr(factory, '__name__', 'pool')
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            self.created += 1
+        obj.pooled = False
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        # Un sprite peut être tué plusieurs fois: on ne le rend qu'une seule fois
+        if getattr(obj, 'pooled', True):
+            return
+        obj.pooled = True
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def prefill(self, count, *args, **kwargs):
+        """Complète la réserve jusqu'à count objets libres (par ex. au lancement d'une mission).
+
+        Les objets vont directement dans la réserve: ils ne comptent pas dans high_water.
+        """
+        for _ in range(count - len(self.free)):
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            obj.pooled = True
+            self.created += 1
+            self.free.append(obj)
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
+            'created': self.created,
+            'reused': self.reused,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Pool {s['name']}: {s['in_use']} utilisés, {s['free']} libres, "
+                f"pic {s['high_water']}, créés {s['created']}, réutilisés {s['reused']}")
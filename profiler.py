@@ -0,0 +1,130 @@
+import csv
+import time
+from contextlib import contextmanager
+
+import pygame
+from text_cache import text_cache
+
+OVERLAY_FONT = (None, 18)
+OVERLAY_REFRESH_FRAMES = 30  # le texte de l'overlay n'est recalculé que toutes les 30 frames
+
+
+class FrameProfiler:
+    """Durée de chaque phase de chaque frame, gardée dans un tampon circulaire de taille fixe.
+
+    record(nom, ms) a la même signature que le callback on_phase de World.tick et
+    draw_mission; section(nom) mesure un bloc de la boucle principale.
+    """
+
+    def __init__(self, size=600):
+        self.size = size
+        self.frame_ids = [0] * size
+        self.totals = [0.0] * size
+        self.columns = {}      # phase -> [ms] * size
+        self.current = {}
+        self.index = 0         # prochaine case à écrire
+        self.count = 0         # nombre de cases remplies
+        self.frame = 0
+        self.frame_start = None
+        self.show_overlay = False
+        self._overlay_lines = []
+        self._overlay_age = OVERLAY_REFRESH_FRAMES
+
+    # --- Mesure ---
+    def begin_frame(self):
+        self.current.clear()
+        self.frame_start = time.perf_counter()
+
+    def record(self, name, ms):
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        i = self.index
+        self.frame += 1
+        self.frame_ids[i] = self.frame
+        self.totals[i] = (time.perf_counter() - self.frame_start) * 1000
+        for name in self.current:
+            if name not in self.columns:
+                self.columns[name] = [0.0] * self.size
+        for name, column in self.columns.items():
+            column[i] = self.current.get(name, 0.0)
+        self.index = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.frame_start = None
+
+    # --- Lecture ---
+    def _slots(self):
+        """Indices des cases remplies, du plus ancien au plus récent."""
+        start = (self.index - self.count) % self.size
+        return [(start + k) % self.size for k in range(self.count)]
+
+    def averages(self):
+        if not self.count:
+            return {}
+        slots = self._slots()
+        return {name: sum(column[i] for i in slots) / self.count for name, column in self.columns.items()}
+
+    def worst_frames(self, n=3):
+        """Les n frames les plus lentes: (n° de frame, total ms, phase la plus coûteuse, ms)."""
+        worst = sorted(self._slots(), key=lambda i: self.totals[i], reverse=True)[:n]
+        result = []
+        for i in worst:
+            phase, ms = max(((name, column[i]) for name, column in self.columns.items()),
+                            key=lambda item: item[1], default=("-", 0.0))
+            result.append((self.frame_ids[i], self.totals[i], phase, ms))
+        return result
+
+    def export_csv(self, path):
+        names = list(self.columns)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + names)
+            for i in self._slots():
+                writer.writerow([self.frame_ids[i], f"{self.totals[i]:.3f}"]
+                                + [f"{self.columns[name][i]:.3f}" for name in names])
+        return path
+
+    # --- Overlay ---
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self._overlay_age = OVERLAY_REFRESH_FRAMES
+
+    def _build_overlay_lines(self):
+        lines = []
+        if self.count:
+            slots = self._slots()
+            avg_total = sum(self.totals[i] for i in slots) / self.count
+            lines.append(f"frame moy {avg_total:.2f} ms ({self.count} frames)")
+        for name, avg in sorted(self.averages().items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{name:<16} {avg:6.2f} ms")
+        lines.append("pires frames:")
+        for frame, total, phase, ms in self.worst_frames():
+            lines.append(f"#{frame} {total:.1f} ms ({phase} {ms:.1f})")
+        return lines
+
+    def draw_overlay(self, screen):
+        """Dessine l'overlay s'il est affiché et retourne la zone touchée (ou None)."""
+        if not self.show_overlay:
+            return None
+        self._overlay_age += 1
+        if self._overlay_age >= OVERLAY_REFRESH_FRAMES:
+            self._overlay_lines = self._build_overlay_lines()
+            self._overlay_age = 0
+        line_height = 16
+        panel = pygame.Rect(5, 5, 240, line_height * len(self._overlay_lines) + 8)
+        screen.fill((0, 0, 0), panel)
+        pygame.draw.rect(screen, (255, 255, 255), panel, 1)
+        for k, line in enumerate(self._overlay_lines):
+            text = text_cache.render(OVERLAY_FONT, line, True, (200, 255, 200))
+            screen.blit(text, (panel.x + 4, panel.y + 4 + k * line_height))
+        return panel
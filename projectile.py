@@ -1,18 +1,37 @@
 import pygame
+from assets import circle_image
+from pool import Pool
 
 class Projectile(pygame.sprite.Sprite):
+    pool = None  # réserve d'origine si l'instance vient de projectile_pool
+
     def __init__(self, pos, velocity, screen_rect=None, damage=1):
         super().__init__()
         size = 6
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 0), (size//2, size//2), size//2)
+        self.image = circle_image(size, (255, 255, 0))
         self.rect = self.image.get_rect(center=pos)
+        self.reset(pos, velocity, screen_rect, damage)
+
+    def reset(self, pos, velocity, screen_rect=None, damage=1):
+        """Réinitialise un projectile recyclé."""
+        self.rect.center = pos
+        self.last_topleft = self.rect.topleft  # position au début du tick, pour les collisions balayées
         self.vel = pygame.math.Vector2(velocity)
         self.screen_rect = screen_rect
         self.damage = damage
+        self.prev_tick = None  # pas d'interpolation depuis la position d'un tir précédent
 
     def update(self, *args):
+        self.last_topleft = self.rect.topleft
         self.rect.x += self.vel.x
         self.rect.y += self.vel.y
         if self.screen_rect and not self.screen_rect.colliderect(self.rect):
             self.kill()
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
+
+projectile_pool = Pool(Projectile, "projectiles")
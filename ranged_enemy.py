@@ -1,27 +1,45 @@
 import pygame
 import random
 import math
+from assets import assets
+from pool import Pool
 
 class RangedEnemy(pygame.sprite.Sprite):
-    def __init__(self, screen_rect, hp=2, damage=1):
+    pool = None  # réserve d'origine si l'instance vient de ranged_enemy_pool
+    # État de l'ordonnanceur LOD (lod.py): ticks dus et période de mise à jour
+    lod_pending = None
+    lod_period = 1
+
+    def __init__(self, screen_rect, hp=2, damage=1, rng=None):
         super().__init__()
-        self.image = pygame.Surface((25, 25))
-        self.image.fill((255, 165, 0))  # orange pour les ennemis à distance
-        self.rect = self.image.get_rect(center=(random.randint(50, screen_rect.width-50), random.randint(50, screen_rect.height-50)))
+        self.image = assets.solid((25, 25), (255, 165, 0))  # orange pour les ennemis à distance
+        self.rect = self.image.get_rect()
+        self.reset(screen_rect, hp, damage, rng)
+
+    def reset(self, screen_rect, hp=2, damage=1, rng=None):
+        """Réinitialise un ennemi recyclé (mêmes arguments que le constructeur)."""
+        rng = rng or random
+        self.rect.center = (rng.randint(50, screen_rect.width-50), rng.randint(50, screen_rect.height-50))
         self.speed = 1  # plus lent que les ennemis normaux
         self.screen_rect = screen_rect
         self.hp = hp
+        self.max_hp = hp  # pour la barre de vie
         self.damage = damage
         # Tir
-        self.last_shot = 0
         self.shot_cooldown = 1500  # ms entre les tirs
+        # Prêt à tirer dès son apparition, même dans les premières secondes de la mission
+        self.last_shot = -self.shot_cooldown
         self.projectile_speed = 5
+        self.lod_pending = None
+        self.lod_period = 1
+        self.prev_tick = None  # pas d'interpolation depuis la position d'une vie précédente
 
-    def update(self, target):
+    def update(self, target, steps=1):
         # Se rapprocher du joueur mais moins vite
         direction = pygame.math.Vector2(target.rect.center) - pygame.math.Vector2(self.rect.center)
         if direction.length() > 0:
-            move = direction.normalize() * self.speed
+            # steps > 1: plusieurs ticks d'un coup (ennemi lointain mis à jour moins souvent)
+            move = direction.normalize() * (self.speed * steps)
             self.rect.x += move.x
             self.rect.y += move.y
         # Empêcher de sortir de l'écran
@@ -33,7 +51,7 @@ class RangedEnemy(pygame.sprite.Sprite):
         if now - self.last_shot < self.shot_cooldown:
             return None
         
-        from projectile import Projectile
+        from projectile import projectile_pool
         start = pygame.math.Vector2(self.rect.center)
         target_pos = pygame.math.Vector2(target.rect.center)
         direction = target_pos - start
@@ -41,8 +59,16 @@ class RangedEnemy(pygame.sprite.Sprite):
             direction = pygame.math.Vector2(1, 0)
         velocity = direction.normalize() * self.projectile_speed
         self.last_shot = now
-        return Projectile(self.rect.center, velocity, self.screen_rect, damage=max(1, int(self.damage * 0.5)))
+        return projectile_pool.acquire(self.rect.center, velocity, self.screen_rect, damage=max(1, int(self.damage * 0.5)))
 
     def take_damage(self, amount=1):
         self.hp -= amount
         return self.hp <= 0
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
+
+ranged_enemy_pool = Pool(RangedEnemy, "ranged_enemies")
@@ -0,0 +1,201 @@
+import time
+
+import pygame
+from text_cache import text_cache
+from hpbars import HealthBarRenderer
+
+# --- Couleurs ---
+BLACK = (0, 0, 0)
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+
+# Police du HUD, chargée une seule fois
+HUD_FONT = (None, 16)
+
+# Barres de vie des ennemis (skip_full=True masque celles des ennemis à pleine vie)
+HIDE_FULL_HP_BARS = False
+hp_bars = HealthBarRenderer(skip_full=HIDE_FULL_HP_BARS)
+
+
+def sprite_pos(sprite, alpha, tick, offset=(0, 0)):
+    """Position d'affichage: interpolée entre le début et la fin du tick si alpha est fourni,
+    puis décalée de offset (coin haut-gauche de la caméra)."""
+    x, y = sprite.rect.topleft
+    ox, oy = offset
+    if alpha is None or getattr(sprite, 'prev_tick', None) != tick:
+        return x - ox, y - oy
+    px, py = sprite.prev_pos
+    return round(px + (x - px) * alpha) - ox, round(py + (y - py) * alpha) - oy
+
+
+def camera_offset(world, alpha=None):
+    """Coin haut-gauche de la caméra, interpolé comme les sprites si alpha est fourni."""
+    x, y = world.camera.topleft
+    if alpha is None or not world.track_previous:
+        return x, y
+    px, py = world.prev_camera
+    return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
+
+class SpriteBatch:
+    """Dessine plusieurs groupes en un seul blits, regroupé par image, sans les sprites hors de vue.
+
+    Les sprites d'un même type partagent leur image (assets.solid / circle_image): les
+    blits qui se suivent sur la même source restent dans le cache. L'ordre entre images
+    est celui de leur première apparition (le joueur, puis les groupes dans l'ordre donné).
+
+    Si toute l'arène tient à l'écran (cull=False), rien n'est à éliminer: les groupes sont
+    dessinés dans l'ordre, sans tri par image (chaque groupe partage déjà la sienne).
+    """
+
+    def __init__(self):
+        self.last_drawn = 0
+        self.last_culled = 0
+
+    def draw(self, screen, layers, alpha=None, tick=None, offset=(0, 0), rects=None, cull=True):
+        """layers: [(groupe, interpolé), ...]; les positions non interpolées ignorent alpha."""
+        if cull:
+            blits = self._visible_blits(screen, layers, alpha, tick, offset)
+        else:
+            ox, oy = offset
+            blits = []
+            for group, interpolated in layers:
+                if interpolated and alpha is not None:
+                    blits += [(s.image, sprite_pos(s, alpha, tick, offset)) for s in group]
+                else:
+                    blits += [(s.image, (s.rect.x - ox, s.rect.y - oy)) for s in group]
+            self.last_culled = 0
+        self.last_drawn = len(blits)
+        if rects is None:
+            screen.blits(blits, doreturn=False)
+        else:
+            rects.extend(screen.blits(blits))
+
+    def _visible_blits(self, screen, layers, alpha, tick, offset):
+        """Blits des sprites visibles, regroupés par image."""
+        width, height = screen.get_size()
+        ox, oy = offset
+        # Zone visible en coordonnées de l'arène (positions non interpolées)
+        colliderect = pygame.Rect(ox, oy, width, height).colliderect
+        batches = {}
+        culled = 0
+        image = append = None
+        for group, interpolated in layers:
+            interpolate = interpolated and alpha is not None
+            for sprite in group:
+                rect = sprite.rect
+                if interpolate:
+                    x, y = sprite_pos(sprite, alpha, tick, offset)
+                    # Hors de l'écran: rien à dessiner
+                    if x >= width or y >= height or x + rect.w <= 0 or y + rect.h <= 0:
+                        culled += 1
+                        continue
+                elif colliderect(rect):
+                    x = rect.x - ox
+                    y = rect.y - oy
+                else:
+                    culled += 1
+                    continue
+                # Les sprites d'un groupe partagent en général la même image: on garde son lot
+                if sprite.image is not image:
+                    image = sprite.image
+                    batch = batches.get(image)
+                    if batch is None:
+                        batch = batches[image] = []
+                    append = batch.append
+                append((image, (x, y)))
+        self.last_culled = culled
+        return [blit for batch in batches.values() for blit in batch]
+
+
+sprite_batch = SpriteBatch()
+
+
+def draw_sprites(screen, world, alpha=None, rects=None):
+    # Tout ce qui est dans l'arène est dessiné relativement à la caméra, en un seul blits;
+    # élimination hors champ seulement si l'arène dépasse la vue
+    offset = camera_offset(world, alpha)
+    sprite_batch.draw(screen, [((world.player,), True), (world.enemies, True), (world.projectiles, True),
+                               (world.enemy_projectiles, True), (world.golds, False)],
+                      alpha, world.ticks, offset, rects, cull=world.bounds != world.camera)
+
+
+def draw_enemy_hp_bars(screen, world, alpha=None, rects=None):
+    # Dessiner les barres de vie des ennemis (images pré-rendues, un seul blits)
+    offset = camera_offset(world, alpha)
+    if alpha is None and offset == (0, 0):
+        hp_bars.draw(screen, world.enemies, rects=rects)
+    else:
+        tick = world.ticks
+        hp_bars.draw(screen, world.enemies, lambda enemy: sprite_pos(enemy, alpha, tick, offset), rects)
+
+
+def draw_extraction(screen, world, alpha=None, rects=None):
+    # Dessiner la zone d'extraction si active
+    if world.extraction_active:
+        offset = camera_offset(world, alpha)
+        zone = world.extraction_rect.move(-offset[0], -offset[1])
+        pygame.draw.rect(screen, BLUE, zone)
+        drawn = pygame.draw.rect(screen, (255,255,255), zone, 2)
+        if rects is not None:
+            rects.append(drawn)
+
+
+def draw_hud(screen, world, alpha=None, rects=None):
+    player = world.player
+    width, height = screen.get_size()
+    # Affichage des barres de HP et XP (en bas au centre)
+    bar_width = 300
+    bar_height = 20
+    bar_x = width // 2 - bar_width // 2
+    bar_y_hp = height - 80
+    bar_y_xp = height - 40
+    
+    # Barre de HP
+    hp_ratio = max(0, player.hp / player.max_hp)
+    pygame.draw.rect(screen, RED, (bar_x, bar_y_hp, bar_width, bar_height))
+    pygame.draw.rect(screen, GREEN, (bar_x, bar_y_hp, int(bar_width * hp_ratio), bar_height))
+    pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y_hp, bar_width, bar_height), 2)
+    hp_text = text_cache.render(HUD_FONT, f"HP: {player.hp}/{player.max_hp}", True, (255, 255, 255))
+    screen.blit(hp_text, (bar_x + 5, bar_y_hp + 2))
+    
+    # Barre d'XP
+    xp_for_next_level = player.level * 100
+    xp_ratio = min(1, player.xp / xp_for_next_level) if xp_for_next_level > 0 else 0
+    pygame.draw.rect(screen, (100, 100, 100), (bar_x, bar_y_xp, bar_width, bar_height))
+    pygame.draw.rect(screen, (200, 200, 255), (bar_x, bar_y_xp, int(bar_width * xp_ratio), bar_height))
+    pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y_xp, bar_width, bar_height), 2)
+    xp_text = text_cache.render(HUD_FONT, f"XP: {player.xp}/{xp_for_next_level} (Lvl {player.level})", True, (255, 255, 255))
+    screen.blit(xp_text, (bar_x + 5, bar_y_xp + 2))
+    if rects is not None:
+        # Le texte peut déborder de la barre: on prend l'union des deux
+        rects.append(pygame.Rect(bar_x, bar_y_hp, bar_width, bar_height).union(hp_text.get_rect(topleft=(bar_x + 5, bar_y_hp + 2))))
+        rects.append(pygame.Rect(bar_x, bar_y_xp, bar_width, bar_height).union(xp_text.get_rect(topleft=(bar_x + 5, bar_y_xp + 2))))
+
+
+# Étapes d'affichage d'une frame de mission, dans l'ordre (nommées pour les mesures)
+DRAW_PHASES = [
+    ("draw_sprites", draw_sprites),
+    ("draw_hp_bars", draw_enemy_hp_bars),
+    ("draw_extraction", draw_extraction),
+    ("draw_hud", draw_hud),
+]
+
+
+def draw_mission(screen, world, on_phase=None, alpha=None, rects=None, clear=True):
+    """Dessine une frame de mission. on_phase(nom, ms) reçoit la durée de chaque étape si fourni.
+
+    alpha (0..1) interpole les sprites entre le début et la fin du dernier tick
+    (nécessite world.track_previous). Si rects est une liste, chaque zone dessinée y
+    est ajoutée; clear=False laisse l'effacement au DirtyRectRenderer.
+    """
+    if clear:
+        screen.fill(BLACK)
+    for name, draw in DRAW_PHASES:
+        if on_phase is None:
+            draw(screen, world, alpha, rects)
+        else:
+            start = time.perf_counter()
+            draw(screen, world, alpha, rects)
+            on_phase(name, (time.perf_counter() - start) * 1000)
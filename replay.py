@@ -0,0 +1,255 @@
+"""Enregistrement des entrées d'une mission et rejeu sans affichage.
+
+L'enregistrement commence par une sauvegarde complète du monde (snapshot, qui contient
+l'état du générateur aléatoire), puis écrit au fil de l'eau les entrées de chaque tick;
+les ticks consécutifs sans tir et avec la même direction sont fusionnés. Une empreinte
+de l'état est écrite tous les HASH_INTERVAL ticks pour détecter une divergence au rejeu.
+
+Usage: python replay.py last_mission.rec [--repeat 3] [--no-check]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import struct
+import time
+
+import snapshot
+from world import TickInput
+
+MAGIC = b"TSRP"
+REPLAY_VERSION = 4
+HASH_INTERVAL = 60  # une empreinte par seconde simulée
+
+HEADER = struct.Struct("<4sHqBI")  # magic, version, graine (-1 si aucune), options, taille du snapshot
+FLAG_LOD = 1                       # ennemis mis à jour par lod.UpdateScheduler (niveaux par défaut)
+FLAG_ARENA = 2                     # grande arène, configuration dans ARENA juste après l'en-tête
+ARENA = struct.Struct("<IIIII")    # taille, taille des chunks, marge active, intervalle grossier
+TAG = struct.Struct("<c")
+INPUT = struct.Struct("<bbBHHH")   # dx, dy, nombre de tirs, ticks identiques, quota LOD, plafond d'ennemis
+NO_QUOTA = 0xFFFF                  # aussi: pas de plafond d'ennemis
+SHOT = struct.Struct("<hh")
+HASH = struct.Struct("<II")        # tick, empreinte
+SIZE = struct.Struct("<I")         # taille d'un snapshot (rechargement en cours de mission)
+
+TAG_INPUT = b"I"
+TAG_HASH = b"H"
+TAG_SNAPSHOT = b"S"
+
+
+class InputRecorder:
+    """Joue les ticks du monde en enregistrant leurs entrées dans un fichier."""
+
+    def __init__(self, path, world, buildings, hash_interval=HASH_INTERVAL):
+        self.path = path
+        self.world = world
+        self.buildings = buildings
+        self.hash_interval = hash_interval
+        self.file = open(path, "wb")
+        state = snapshot.dumps(world, buildings)
+        seed = world.seed if world.seed is not None else -1
+        flags = (FLAG_LOD if world.lod and not world.swarm else 0) | (FLAG_ARENA if world.arena else 0)
+        self.file.write(HEADER.pack(MAGIC, REPLAY_VERSION, seed, flags, len(state)))
+        if world.arena:
+            arena = world.arena
+            self.file.write(ARENA.pack(arena.rect.width, arena.rect.height, arena.chunk_size,
+                                       arena.margin, arena.coarse_interval))
+        self.file.write(state)
+        self.pending = None  # (dx, dy, quota, plafond, ticks) en attente de fusion
+        self.ticks = 0
+
+    def _flush_pending(self):
+        if self.pending:
+            dx, dy, quota, cap, repeat = self.pending
+            self.file.write(TAG_INPUT + INPUT.pack(dx, dy, 0, repeat, quota, cap))
+            self.pending = None
+
+    def _record(self, inp):
+        quota = NO_QUOTA if inp.lod_quota is None else min(inp.lod_quota, NO_QUOTA - 1)
+        cap = NO_QUOTA if inp.enemy_cap is None else min(inp.enemy_cap, NO_QUOTA - 1)
+        if not inp.shots:
+            key = (inp.dx, inp.dy, quota, cap)
+            pending = self.pending
+            if pending and pending[:4] == key and pending[4] < 0xFFFF:
+                self.pending = (*key, pending[4] + 1)
+                return
+            self._flush_pending()
+            self.pending = (*key, 1)
+            return
+        self._flush_pending()
+        shots = inp.shots[:255]
+        self.file.write(TAG_INPUT + INPUT.pack(inp.dx, inp.dy, len(shots), 1, quota, cap)
+                        + b"".join(SHOT.pack(int(x), int(y)) for x, y in shots))
+
+    def _write_hash(self):
+        self._flush_pending()
+        self.file.write(TAG_HASH + HASH.pack(self.world.ticks, self.world.state_digest()))
+
+    def tick(self, inp, on_phase=None):
+        """Comme World.tick, en enregistrant inp. Retourne l'état du monde."""
+        self._record(inp)
+        state = self.world.tick(inp, on_phase=on_phase)
+        self.ticks += 1
+        if self.world.ticks % self.hash_interval == 0:
+            self._write_hash()
+        return state
+
+    def restored(self):
+        """À appeler après un rechargement de sauvegarde: le rejeu rechargera le même état."""
+        self._flush_pending()
+        state = snapshot.dumps(self.world, self.buildings)
+        self.file.write(TAG_SNAPSHOT + SIZE.pack(len(state)) + state)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._write_hash()
+        self.file.close()
+
+    def report(self):
+        size = os.path.getsize(self.path)
+        return f"Enregistrement: {self.ticks} ticks dans {self.path} ({size} octets)"
+
+
+class ReplayError(ValueError):
+    """Fichier d'enregistrement illisible ou d'une autre version."""
+
+
+def read_recording(path):
+    """Retourne (graine, options, arène, snapshot initial, événements) où arène est la
+    configuration de ChunkedArena (taille, chunk, marge, intervalle) ou None, et chaque événement est
+    ('input', TickInput, répétitions), ('hash', tick, empreinte) ou ('snapshot', bytes)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        magic, version, seed, flags, size = HEADER.unpack_from(data, 0)
+    except struct.error as e:
+        raise ReplayError(f"Enregistrement tronqué: {e}") from e
+    if magic != MAGIC:
+        raise ReplayError(f"{path} n'est pas un enregistrement Tune Shooter")
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"Version d'enregistrement {version} non supportée (attendue: {REPLAY_VERSION})")
+    offset = HEADER.size
+    arena = None
+    if flags & FLAG_ARENA:
+        arena = ARENA.unpack_from(data, offset)
+        offset += ARENA.size
+    initial = data[offset:offset + size]
+    offset += size
+
+    events = []
+    try:
+        while offset < len(data):
+            (tag,) = TAG.unpack_from(data, offset)
+            offset += TAG.size
+            if tag == TAG_INPUT:
+                dx, dy, count, repeat, quota, cap = INPUT.unpack_from(data, offset)
+                offset += INPUT.size
+                shots = list(SHOT.iter_unpack(data[offset:offset + count * SHOT.size]))
+                offset += count * SHOT.size
+                events.append(("input", TickInput(dx, dy, shots, None if quota == NO_QUOTA else quota,
+                                                  None if cap == NO_QUOTA else cap), repeat))
+            elif tag == TAG_HASH:
+                events.append(("hash", *HASH.unpack_from(data, offset)))
+                offset += HASH.size
+            elif tag == TAG_SNAPSHOT:
+                (length,) = SIZE.unpack_from(data, offset)
+                offset += SIZE.size
+                events.append(("snapshot", data[offset:offset + length]))
+                offset += length
+            else:
+                raise ReplayError(f"Bloc inconnu {tag!r} à l'octet {offset - TAG.size}")
+    except struct.error:
+        # Fin tronquée (partie interrompue brutalement): on rejoue ce qui est complet
+        pass
+    return (seed if seed >= 0 else None), flags, arena, initial, events
+
+
+def replay(path, check=True):
+    """Rejoue un enregistrement aussi vite que possible.
+
+    Retourne un dict: ticks joués, durées par tick (ms), totaux par phase (ms),
+    nombre d'empreintes vérifiées et premier tick divergent (ou None).
+    """
+    from headless import make_world, WIDTH, HEIGHT
+    from base import BaseZone
+
+    seed, flags, arena, initial, events = read_recording(path)
+    options = {}
+    if flags & FLAG_LOD:
+        from lod import UpdateScheduler
+        # Le budget de temps de l'enregistrement est rejoué via les quotas enregistrés
+        options.update(swarm=False, lod=UpdateScheduler(budget_ms=None))
+    if arena:
+        from arena import ChunkedArena
+        width, height, chunk_size, margin, coarse_interval = arena
+        options["arena"] = ChunkedArena((width, height), chunk_size, margin, coarse_interval)
+    world = make_world(seed or 0, **options)
+    buildings = BaseZone(WIDTH, HEIGHT, world.player).buildings
+    snapshot.loads(initial, world, buildings)
+
+    tick_ms = []
+    phases = {}
+
+    def record(name, ms):
+        phases[name] = phases.get(name, 0.0) + ms
+
+    checked = 0
+    diverged = None
+    for event in events:
+        kind = event[0]
+        if kind == "input":
+            _, inp, repeat = event
+            for _ in range(repeat):
+                start = time.perf_counter()
+                world.tick(inp, on_phase=record)
+                tick_ms.append((time.perf_counter() - start) * 1000)
+        elif kind == "hash":
+            _, tick, digest = event
+            if check:
+                checked += 1
+                if tick != world.ticks or world.state_digest() != digest:
+                    diverged = tick
+                    break
+        else:
+            snapshot.loads(event[1], world, buildings)
+    return {"ticks": len(tick_ms), "tick_ms": tick_ms, "phases": phases,
+            "checked": checked, "diverged": diverged, "state": world.state}
+
+
+def print_report(result, elapsed):
+    from benchmark import percentile
+    values = sorted(result["tick_ms"])
+    ticks = result["ticks"]
+    print(f"{ticks} ticks rejoués en {elapsed:.3f}s ({ticks / elapsed if elapsed else 0:.0f} ticks/s), "
+          f"état final: {result['state']}")
+    if values:
+        print("ms/tick: " + " ".join(f"p{p} {percentile(values, p):.3f}" for p in (50, 95, 99))
+              + f" max {values[-1]:.3f}")
+    total = sum(result["phases"].values()) or 1.0
+    for name, ms in sorted(result["phases"].items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<16} {ms:9.2f} ms ({ms / total:5.1%})")
+    if result["diverged"] is not None:
+        print(f"DIVERGENCE au tick {result['diverged']} ({result['checked']} empreintes vérifiées)")
+    else:
+        print(f"{result['checked']} empreintes vérifiées, aucune divergence")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue un enregistrement de mission sans affichage")
+    parser.add_argument("path")
+    parser.add_argument("--repeat", type=int, default=1, help="nombre de rejeux (stats de chaque rejeu)")
+    parser.add_argument("--no-check", action="store_true", help="ne pas vérifier les empreintes")
+    args = parser.parse_args()
+
+    failed = False
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = replay(args.path, check=not args.no_check)
+        print_report(result, time.perf_counter() - start)
+        failed |= result["diverged"] is not None
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
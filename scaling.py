@@ -0,0 +1,95 @@
+"""Rendu à une résolution interne plus petite que la fenêtre, agrandi une fois par frame.
+
+Tout le jeu (menus, village, mission) dessine sur ScaledDisplay.surface à la résolution
+interne; flip() / update() l'agrandissent vers la fenêtre en un seul transform.scale puis
+l'envoient à l'écran. Les positions de souris de la fenêtre sont ramenées à la résolution interne
+par to_render() / mouse_pos() avant d'atteindre les clics et les tirs.
+
+Avec sdl_scaled=True, c'est SDL qui agrandit (drapeau pygame.SCALED, sur la carte
+graphique quand le pilote le permet): la fenêtre prend une taille multiple de la
+résolution interne choisie par SDL, et pygame remappe lui-même la souris.
+"""
+import math
+import time
+
+import pygame
+
+
+class ScaledDisplay:
+    """Fenêtre de window_size affichant une surface de rendu de render_size.
+
+    S'utilise comme pygame.display pour l'envoi à l'écran (flip, update), par exemple
+    comme sortie du DirtyRectRenderer.
+    """
+
+    def __init__(self, window_size, render_size, sdl_scaled=False, smooth=False):
+        self.render_size = tuple(render_size)
+        self.smooth = smooth
+        self.sdl_scaled = False
+        if sdl_scaled:
+            try:
+                self.window = pygame.display.set_mode(self.render_size, pygame.SCALED)
+                self.sdl_scaled = True
+            except pygame.error:
+                # Pas de renderer SDL (pilote dummy...): agrandissement par transform.scale
+                pass
+        if not self.sdl_scaled:
+            self.window = pygame.display.set_mode(window_size)
+        self.window_size = self.window.get_size()
+        # Même taille (ou SDL s'en charge): on dessine directement dans la fenêtre
+        self.scaled = not self.sdl_scaled and self.window_size != self.render_size
+        self.surface = pygame.Surface(self.render_size).convert() if self.scaled else self.window
+        self.scale_x = self.window_size[0] / self.render_size[0]
+        self.scale_y = self.window_size[1] / self.render_size[1]
+        # Compteurs
+        self.frames = 0
+        self.scale_ms = 0.0
+
+    def to_render(self, pos):
+        """Position dans la fenêtre -> position sur la surface de rendu."""
+        if not self.scaled:
+            return pos
+        x = min(self.render_size[0] - 1, int(pos[0] / self.scale_x))
+        y = min(self.render_size[1] - 1, int(pos[1] / self.scale_y))
+        return (x, y)
+
+    def mouse_pos(self):
+        return self.to_render(pygame.mouse.get_pos())
+
+    def _upscale(self):
+        start = time.perf_counter()
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.window_size, self.window)
+        else:
+            pygame.transform.scale(self.surface, self.window_size, self.window)
+        self.scale_ms += (time.perf_counter() - start) * 1000
+        self.frames += 1
+
+    def to_window(self, rect):
+        """Zone de la surface de rendu -> zone couverte dans la fenêtre (arrondie vers l'extérieur)."""
+        left = int(rect.left * self.scale_x)
+        top = int(rect.top * self.scale_y)
+        right = math.ceil(rect.right * self.scale_x)
+        bottom = math.ceil(rect.bottom * self.scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def flip(self):
+        if self.scaled:
+            self._upscale()
+        pygame.display.flip()
+
+    def update(self, rects):
+        """Comme pygame.display.update: seules les zones données sont envoyées à l'écran."""
+        if not self.scaled:
+            pygame.display.update(rects)
+            return
+        self._upscale()
+        pygame.display.update([self.to_window(rect) for rect in rects])
+
+    def report(self):
+        if not self.scaled:
+            mode = "SDL (pygame.SCALED)" if self.sdl_scaled else "sans agrandissement"
+            return f"Résolution interne {self.render_size[0]}x{self.render_size[1]}, {mode}"
+        avg = self.scale_ms / self.frames if self.frames else 0
+        return (f"Résolution interne {self.render_size[0]}x{self.render_size[1]} agrandie vers "
+                f"{self.window_size[0]}x{self.window_size[1]}: {self.frames} frames, {avg:.2f} ms par agrandissement")
@@ -0,0 +1,253 @@
+"""Simulation sur un thread de travail, découplée de l'affichage.
+
+Le thread de simulation joue les ticks à pas fixe (timestep.FixedTimestep) et publie
+après chaque tick un RenderSnapshot: une copie figée de ce que l'affichage lit
+(positions courantes et précédentes, hp, caméra, extraction, valeurs du HUD). Le
+double tampon est fait de deux références: le snapshot publié (front), que le thread
+principal garde pendant toute sa frame, et celui en construction (back), qui remplace
+le front d'une seule affectation. Le thread principal dessine le dernier front à la
+cadence de l'écran, sans jamais toucher au World.
+
+Les entrées du thread principal (direction, tirs) sont déposées par post_input() et
+livrées au prochain tick. Sauvegarde et rechargement passent par self.lock, tenu par
+le thread de simulation pendant chaque tick.
+
+Mesures (report()): latence entre la saisie des entrées d'un tick et l'affichage du
+snapshot correspondant, âge du snapshot affiché, part de chaque frame d'affichage
+pendant laquelle un tick tournait (chevauchement) et part de temps CPU effectif de
+chaque étage: avec le GIL, deux étages qui se chevauchent dans le temps ne tournent
+vraiment en parallèle que pendant les appels qui le relâchent (SDL, numpy).
+"""
+import threading
+import time
+from collections import deque
+
+from timestep import FixedTimestep
+from world import TickInput
+
+MAX_CATCHUP_TICKS = 5
+INTERVAL_HISTORY = 256   # intervalles de tick gardés pour calculer le chevauchement
+
+
+class SpriteView:
+    """Copie figée d'un sprite pour l'affichage (mêmes attributs que ceux lus par render.py)."""
+
+    __slots__ = ("rect", "image", "prev_pos", "prev_tick", "hp", "max_hp")
+
+    def __init__(self, sprite):
+        self.rect = sprite.rect.copy()
+        self.image = sprite.image
+        self.prev_pos = getattr(sprite, 'prev_pos', None)
+        self.prev_tick = getattr(sprite, 'prev_tick', None)
+        self.hp = getattr(sprite, 'hp', None)
+        self.max_hp = getattr(sprite, 'max_hp', None)
+
+
+class PlayerView(SpriteView):
+    """Le joueur, avec les valeurs du HUD."""
+
+    __slots__ = ("xp", "level")
+
+    def __init__(self, player):
+        super().__init__(player)
+        self.xp = player.xp
+        self.level = player.level
+
+
+class RenderSnapshot:
+    """État affichable d'un World après un tick; se dessine avec render.draw_mission.
+
+    Ne pas modifier: le thread principal le lit pendant que le suivant se construit.
+    """
+
+    __slots__ = ("ticks", "state", "track_previous", "bounds", "camera", "prev_camera", "player", "enemies",
+                 "projectiles", "enemy_projectiles", "golds", "extraction_active", "extraction_rect",
+                 "input_time", "published")
+
+    def __init__(self, world, input_time):
+        self.ticks = world.ticks
+        self.state = world.state
+        self.track_previous = world.track_previous
+        self.bounds = world.bounds
+        self.camera = world.camera.copy()
+        self.prev_camera = world.prev_camera
+        self.player = PlayerView(world.player)
+        self.enemies = tuple(SpriteView(sprite) for sprite in world.enemies)
+        self.projectiles = tuple(SpriteView(sprite) for sprite in world.projectiles)
+        self.enemy_projectiles = tuple(SpriteView(sprite) for sprite in world.enemy_projectiles)
+        self.golds = tuple(SpriteView(sprite) for sprite in world.golds)
+        self.extraction_active = world.extraction_active
+        self.extraction_rect = world.extraction_rect.copy()
+        self.input_time = input_time          # perf_counter des entrées livrées à ce tick
+        self.published = time.perf_counter()
+
+    def screen_to_world(self, pos):
+        """Position écran -> position dans l'arène, avec la caméra de ce snapshot."""
+        return (pos[0] + self.camera.x, pos[1] + self.camera.y)
+
+
+class SimulationThread:
+    """Thread de simulation à pas fixe publiant un RenderSnapshot par tick.
+
+    step(inp) joue un tick (World.tick ou InputRecorder.tick). Le plafond d'ennemis
+    (cap_controller) est calculé ici à partir de la durée mesurée des ticks, comme le
+    quota LOD: il est livré dans TickInput et reste donc rejouable.
+    """
+
+    def __init__(self, world, step=None, cap_controller=None, max_catchup=MAX_CATCHUP_TICKS):
+        self.world = world
+        self.step = step or world.tick
+        self.cap_controller = cap_controller
+        self.timestep = FixedTimestep(max_catchup=max_catchup)
+        self.lock = threading.Lock()          # tenu pendant chaque tick (sauvegarde, rechargement)
+        self._input_lock = threading.Lock()
+        self._direction = (0, 0)
+        self._shots = []
+        self._input_time = time.perf_counter()
+        self.front = None                     # dernier snapshot publié
+        self.error = None                     # exception du thread, relancée par check()
+        self.finished = False
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        # Intervalles (début, fin) des derniers ticks, en perf_counter
+        self._intervals = deque(maxlen=INTERVAL_HISTORY)
+        self._intervals_lock = threading.Lock()
+        self.last_tick_ms = 0.0
+        # Compteurs
+        self.published = 0
+        self.sim_wall = 0.0
+        self.sim_cpu = 0.0
+        self.frames = 0
+        self.repeated_frames = 0   # frames qui réaffichent le même snapshot
+        self.skipped = 0           # snapshots publiés jamais affichés
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.age_total = 0.0
+        self.render_wall = 0.0
+        self.render_cpu = 0.0
+        self.overlap_total = 0.0
+        self._last_shown = None
+
+    def start(self):
+        self.world.track_previous = True
+        with self.lock:
+            self._publish(RenderSnapshot(self.world, self._input_time))
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def check(self):
+        """Relance dans le thread principal une exception survenue dans la simulation."""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    # --- Entrées ---
+    def post_input(self, dx, dy, shots):
+        """Direction courante et nouveaux tirs, livrés au prochain tick."""
+        with self._input_lock:
+            self._direction = (dx, dy)
+            self._shots.extend(shots)
+            self._input_time = time.perf_counter()
+
+    def _take_input(self):
+        with self._input_lock:
+            shots, self._shots = self._shots, []
+            return self._direction, shots, self._input_time
+
+    # --- Thread de simulation ---
+    def _run(self):
+        world = self.world
+        timestep = self.timestep
+        tick_s = timestep.tick_ms / 1000
+        last = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                steps = timestep.advance((now - last) * 1000)
+                last = now
+                for _ in range(steps):
+                    (dx, dy), shots, input_time = self._take_input()
+                    with self.lock:
+                        start = time.perf_counter()
+                        cpu = time.thread_time()
+                        enemy_cap = (self.cap_controller.update(self.last_tick_ms, world.enemy_count(), world.max_enemies)
+                                     if self.cap_controller else None)
+                        inp = TickInput(dx, dy, shots, world.lod.suggest_quota() if world.lod else None, enemy_cap)
+                        state = self.step(inp)
+                        self._publish(RenderSnapshot(world, input_time))
+                        end = time.perf_counter()
+                        self.sim_cpu += time.thread_time() - cpu
+                    self.last_tick_ms = (end - start) * 1000
+                    self.sim_wall += end - start
+                    with self._intervals_lock:
+                        self._intervals.append((start, end))
+                    if state != "running":
+                        self.finished = True
+                        return
+                # Attente du prochain tick (le reste du tick en cours)
+                self._stop.wait(max(0.0, tick_s - timestep.accumulator / 1000))
+        except Exception as e:
+            self.error = e
+            self.finished = True
+
+    def _publish(self, snapshot):
+        # Une seule affectation: le thread principal voit l'ancien ou le nouveau snapshot
+        self.front = snapshot
+        self.published += 1
+
+    # --- Thread principal ---
+    def latest(self):
+        """Snapshot à dessiner cette frame (à garder jusqu'à presented())."""
+        return self.front
+
+    def alpha(self, snapshot):
+        """Interpolation entre l'état précédent et celui du snapshot selon son âge (0..1)."""
+        age_ms = (time.perf_counter() - snapshot.published) * 1000
+        return min(1.0, age_ms / self.timestep.tick_ms)
+
+    def presented(self, snapshot, render_start, render_cpu):
+        """Après l'envoi à l'écran: met à jour latence, âge et chevauchement de la frame.
+
+        render_start est le perf_counter et render_cpu le thread_time du début de la frame.
+        """
+        end = time.perf_counter()
+        self.render_cpu += time.thread_time() - render_cpu
+        self.frames += 1
+        self.render_wall += end - render_start
+        latency = end - snapshot.input_time
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.age_total += end - snapshot.published
+        last = self._last_shown
+        if last is snapshot:
+            self.repeated_frames += 1
+        elif last is not None and snapshot.ticks > last.ticks + 1:
+            self.skipped += snapshot.ticks - last.ticks - 1
+        self._last_shown = snapshot
+        # Temps de la frame pendant lequel un tick tournait
+        with self._intervals_lock:
+            intervals = list(self._intervals)
+        overlap = 0.0
+        for start, stop in reversed(intervals):
+            if stop <= render_start:
+                break
+            overlap += min(stop, end) - max(start, render_start)
+        self.overlap_total += max(0.0, overlap)
+
+    def report(self):
+        if not self.frames:
+            return "Simulation en thread: aucune frame affichée"
+        frames = self.frames
+        overlap = self.overlap_total / self.render_wall * 100 if self.render_wall else 0
+        sim_cpu = self.sim_cpu / self.sim_wall * 100 if self.sim_wall else 0
+        render_cpu = self.render_cpu / self.render_wall * 100 if self.render_wall else 0
+        return (f"Simulation en thread: {self.published} snapshots / {frames} frames, "
+                f"{self.repeated_frames} frames répétées, {self.skipped} snapshots jamais affichés; "
+                f"latence entrée -> écran {self.latency_total / frames * 1000:.1f} ms "
+                f"(max {self.latency_max * 1000:.1f}), âge du snapshot {self.age_total / frames * 1000:.1f} ms; "
+                f"chevauchement {overlap:.0f}% du temps d'affichage; CPU effectif: simulation "
+                f"{sim_cpu:.0f}%, affichage {render_cpu:.0f}%")
@@ -0,0 +1,131 @@
+from entity import separate_sprites
+
+# Demi-voisinage: chaque paire de cellules voisines n'est testée qu'une fois
+HALF_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class SpatialHash:
+    """Grille uniforme: chaque sprite est rangé dans la cellule qui contient son centre.
+
+    Tant que cell_size >= la plus grande dimension des sprites, deux sprites qui se
+    chevauchent sont forcément dans la même cellule ou dans deux cellules voisines.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = max(1, int(cell_size))
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def cell_of(self, pos):
+        return (int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size)
+
+    def insert(self, sprite):
+        key = self.cell_of(sprite.rect.center)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [sprite]
+        else:
+            bucket.append(sprite)
+
+    def build(self, sprites):
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query_rect(self, rect):
+        """Retourne les sprites dont le centre tombe dans les cellules couvertes par rect (élargi d'une cellule)."""
+        cs = self.cell_size
+        x0, y0 = rect.left // cs - 1, rect.top // cs - 1
+        x1, y1 = rect.right // cs + 1, rect.bottom // cs + 1
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+
+class SeparationSolver:
+    """Sépare les sprites qui se chevauchent en ne testant que les cellules voisines.
+
+    Chaque paire est résolue par separate_sprites, donc le déplacement appliqué à une
+    paire est identique à celui de la boucle O(n²). Plusieurs passes de relaxation
+    peuvent être faites par frame; on s'arrête dès qu'une passe ne trouve plus de chevauchement.
+    """
+
+    def __init__(self, cell_size=None, passes=1):
+        self.cell_size = cell_size
+        self.passes = passes
+        self.grid = SpatialHash(cell_size or 1)
+        # Statistiques de la dernière résolution
+        self.last_passes = 0
+        self.last_pairs_tested = 0
+        self.last_overlaps = 0
+
+    def _cell_size_for(self, sprites):
+        if self.cell_size:
+            return self.cell_size
+        biggest = 1
+        for sprite in sprites:
+            w, h = sprite.rect.size
+            if w > biggest:
+                biggest = w
+            if h > biggest:
+                biggest = h
+        return biggest
+
+    def solve(self, sprites):
+        sprites = list(sprites)
+        self.last_passes = 0
+        self.last_pairs_tested = 0
+        self.last_overlaps = 0
+        if len(sprites) < 2:
+            return
+        self.grid.cell_size = self._cell_size_for(sprites)
+
+        for _ in range(self.passes):
+            self.grid.build(sprites)
+            overlaps = self._solve_pass(self.grid.cells)
+            self.last_passes += 1
+            self.last_overlaps += overlaps
+            if overlaps == 0:
+                break
+
+    def _solve_pass(self, cells):
+        tested = 0
+        overlaps = 0
+        for (cx, cy), bucket in cells.items():
+            n = len(bucket)
+            # Paires dans la même cellule
+            for i in range(n):
+                a = bucket[i]
+                for j in range(i + 1, n):
+                    b = bucket[j]
+                    tested += 1
+                    if a.rect.colliderect(b.rect):
+                        overlaps += 1
+                        separate_sprites(a, b, push_a=True, push_b=True)
+            # Paires avec les cellules voisines
+            for dx, dy in HALF_NEIGHBOURS:
+                other = cells.get((cx + dx, cy + dy))
+                if not other:
+                    continue
+                for a in bucket:
+                    for b in other:
+                        tested += 1
+                        if a.rect.colliderect(b.rect):
+                            overlaps += 1
+                            separate_sprites(a, b, push_a=True, push_b=True)
+        self.last_pairs_tested += tested
+        return overlaps
+
+
+def separate_all_bruteforce(sprites):
+    """Ancienne résolution O(n²), gardée comme référence pour les benchmarks."""
+    sprite_list = list(sprites)
+    for i in range(len(sprite_list)):
+        for j in range(i + 1, len(sprite_list)):
+            separate_sprites(sprite_list[i], sprite_list[j], push_a=True, push_b=True)
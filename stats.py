@@ -0,0 +1,75 @@
+"""Statistiques dérivées des bâtiments du village, décrites par des tables de données.
+
+BUILDING_MODIFIERS dit ce que chaque niveau de bâtiment ajoute aux statistiques de base,
+UPGRADE_CAPS quel bâtiment débloque chaque amélioration. derived_stats(buildings) compile
+ces tables en un seul enregistrement, gardé en cache jusqu'au prochain changement de
+niveau d'un bâtiment (Building.generation). Ajouter un bâtiment = ajouter une ligne ici.
+"""
+from building import Building
+
+# Valeurs sans aucun bâtiment
+BASE_STATS = {
+    "speed": 5,
+    "projectile_damage": 1,
+    "max_hp": 100,
+    "shot_cooldown": 250,
+    "gold_multiplier": 1.0,
+    "xp_multiplier": 1.0,
+}
+# Valeur minimale de certaines statistiques après bonus
+MIN_STATS = {"projectile_damage": 1}
+
+# Bâtiment -> bonus par niveau de chaque statistique
+BUILDING_MODIFIERS = {
+    "Armurerie": {"projectile_damage": 0.5},   # dégâts des armes
+    "Forge": {"speed": 0.5},                   # vitesse
+    "Temple": {"max_hp": 5},                   # vie max
+    "Marché": {"gold_multiplier": 0.1},        # +10% d'or par niveau
+    "Bibliothèque": {"xp_multiplier": 0.1},    # +10% d'XP par niveau
+}
+
+# Amélioration -> (bâtiment qui la débloque, cap par niveau du bâtiment)
+DEFAULT_UPGRADE_CAP = 50   # cap tant que le bâtiment n'a pas été amélioré
+UPGRADE_CAPS = {
+    "rapid_fire": ("Temple", 5),
+    "move_speed": ("Forge", 5),
+    "projectile_damage": ("Armurerie", 5),
+    "projectile_speed": ("Bibliothèque", 5),
+}
+
+
+class DerivedStats:
+    """Statistiques compilées pour un ensemble de bâtiments (ne pas modifier: partagé)."""
+
+    __slots__ = tuple(BASE_STATS) + ("upgrade_caps",)
+
+    def __init__(self, buildings):
+        values = dict(BASE_STATS)
+        levels = {}
+        for building in buildings:
+            levels[building.name] = building.level
+            for stat, per_level in BUILDING_MODIFIERS.get(building.name, {}).items():
+                values[stat] += building.level * per_level
+        for stat, minimum in MIN_STATS.items():
+            values[stat] = max(minimum, values[stat])
+        for stat, value in values.items():
+            setattr(self, stat, value)
+        # Cap = niveau * cap par niveau, seulement si le bâtiment a été amélioré
+        self.upgrade_caps = {
+            upgrade: levels[name] * per_level if levels.get(name, 0) > 0 else DEFAULT_UPGRADE_CAP
+            for upgrade, (name, per_level) in UPGRADE_CAPS.items()
+        }
+
+
+_cache_key = None
+_cache_stats = None
+
+
+def derived_stats(buildings):
+    """Statistiques dérivées de buildings, recompilées seulement si un niveau a changé."""
+    global _cache_key, _cache_stats
+    key = (Building.generation, id(buildings), len(buildings))
+    if key != _cache_key:
+        _cache_stats = DerivedStats(buildings)
+        _cache_key = key
+    return _cache_stats
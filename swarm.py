@@ -0,0 +1,178 @@
+import pygame
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # numpy est optionnel: sans lui, le mode essaim est désactivé
+    np = None
+    HAVE_NUMPY = False
+
+
+def _round_like_rect(values):
+    """Arrondit comme l'affectation d'un float à un attribut de pygame.Rect (0.5 loin de zéro)."""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+class SwarmGroup(pygame.sprite.Group):
+    """Groupe d'ennemis stockés en structure-of-arrays (positions, vitesses, hp, dégâts).
+
+    Les sprites ne servent plus que de vues pour l'affichage et les collisions pygame:
+    le déplacement vers le joueur, le clamp à l'écran et les dégâts sont calculés en
+    une seule passe vectorisée par tick. Le groupe se synchronise tout seul quand des
+    sprites sont ajoutés, tués ou vidés (add_internal / remove_internal).
+    """
+
+    def __init__(self, screen_rect, *sprites, capacity=64):
+        if not HAVE_NUMPY:
+            raise RuntimeError("Le mode essaim nécessite numpy")
+        self.screen_rect = screen_rect
+        self.members = []
+        self.count = 0
+        self._allocate(capacity)
+        super().__init__(*sprites)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "x", None)
+        fields = {}
+        for name in ("x", "y", "w", "h", "speed", "hp", "damage"):
+            array = np.zeros(capacity, dtype=np.float64)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            fields[name] = array
+        self.__dict__.update(fields)
+        self.capacity = capacity
+
+    # --- Synchronisation avec pygame.sprite.Group ---
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = sprite.rect.x
+        self.y[i] = sprite.rect.y
+        self.w[i] = sprite.rect.width
+        self.h[i] = sprite.rect.height
+        self.speed[i] = sprite.speed
+        self.hp[i] = sprite.hp
+        self.damage[i] = getattr(sprite, 'damage', 1)
+        sprite.swarm_index = i
+        self.members.append(sprite)
+        self.count += 1
+
+    def add(self, *sprites):
+        # Une liste de sprites (arrivée d'une vague, restauration) est ajoutée en bloc:
+        # les tableaux sont remplis par tranches plutôt qu'un élément à la fois
+        if len(sprites) == 1 and isinstance(sprites[0], list):
+            self._add_batch(sprites[0])
+        else:
+            super().add(*sprites)
+
+    def _add_batch(self, sprites):
+        spritedict = self.spritedict
+        new = []
+        for sprite in sprites:
+            if sprite not in spritedict:
+                spritedict[sprite] = None
+                sprite.add_internal(self)
+                new.append(sprite)
+        if not new:
+            return
+        start = self.count
+        end = start + len(new)
+        if end > self.capacity:
+            capacity = self.capacity
+            while capacity < end:
+                capacity *= 2
+            self._allocate(capacity)
+        rects = [sprite.rect for sprite in new]
+        self.x[start:end] = [rect.x for rect in rects]
+        self.y[start:end] = [rect.y for rect in rects]
+        self.w[start:end] = [rect.width for rect in rects]
+        self.h[start:end] = [rect.height for rect in rects]
+        self.speed[start:end] = [sprite.speed for sprite in new]
+        self.hp[start:end] = [sprite.hp for sprite in new]
+        self.damage[start:end] = [getattr(sprite, 'damage', 1) for sprite in new]
+        for i, sprite in enumerate(new, start):
+            sprite.swarm_index = i
+        self.members.extend(new)
+        self.count = end
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        # Retrait en O(1): le dernier élément prend la place du sprite retiré
+        i = sprite.swarm_index
+        last = self.count - 1
+        if i != last:
+            moved = self.members[last]
+            for name in ("x", "y", "w", "h", "speed", "hp", "damage"):
+                array = getattr(self, name)
+                array[i] = array[last]
+            self.members[i] = moved
+            moved.swarm_index = i
+        self.members.pop()
+        sprite.swarm_index = None
+        self.count -= 1
+
+    def pull_positions(self):
+        """Relit les rects (la séparation et les poussées les déplacent directement)."""
+        n = self.count
+        members = self.members
+        self.x[:n] = np.fromiter((s.rect.x for s in members), np.float64, n)
+        self.y[:n] = np.fromiter((s.rect.y for s in members), np.float64, n)
+
+    def push_positions(self):
+        n = self.count
+        for sprite, x, y in zip(self.members, self.x[:n].tolist(), self.y[:n].tolist()):
+            sprite.rect.topleft = (x, y)
+
+    # --- Simulation vectorisée ---
+    def update(self, target):
+        """Déplace tous les ennemis vers la cible en une seule étape vectorisée."""
+        n = self.count
+        if n == 0:
+            return
+        self.pull_positions()
+        x, y, w, h = self.x[:n], self.y[:n], self.w[:n], self.h[:n]
+
+        # Même calcul que Enemy.update: centre entier (x + w // 2) vers le centre de la cible
+        tx, ty = target.rect.center
+        dx = tx - (x + w // 2)
+        dy = ty - (y + h // 2)
+        length = np.hypot(dx, dy)
+        moving = length > 0
+        scale = np.divide(self.speed[:n], length, out=np.zeros(n), where=moving)
+        x += _round_like_rect(dx * scale)
+        y += _round_like_rect(dy * scale)
+
+        # Empêcher de sortir de l'écran (équivalent de clamp_ip)
+        bounds = self.screen_rect
+        np.clip(x, bounds.left, bounds.right - w, out=x)
+        np.clip(y, bounds.top, bounds.bottom - h, out=y)
+        self.push_positions()
+
+    def contact_damage(self, rect):
+        """Somme des dégâts des ennemis dont le rect chevauche rect."""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        touching = ((x < rect.right) & (x + self.w[:n] > rect.left)
+                    & (y < rect.bottom) & (y + self.h[:n] > rect.top))
+        return int(self.damage[:n][touching].sum())
+
+    def apply_damage(self, hits):
+        """Applique une liste de (sprite, dégâts) en une fois et retourne les sprites morts.
+
+        Les hp des sprites touchés sont recopiés pour l'affichage des barres de vie.
+        """
+        if not hits:
+            return []
+        indices = np.fromiter((s.swarm_index for s, _ in hits), np.intp, len(hits))
+        amounts = np.fromiter((dmg for _, dmg in hits), np.float64, len(hits))
+        np.subtract.at(self.hp, indices, amounts)
+        touched = np.unique(indices)
+        dead = []
+        for i, hp in zip(touched.tolist(), self.hp[touched].tolist()):
+            sprite = self.members[i]
+            sprite.hp = hp
+            if hp <= 0:
+                dead.append(sprite)
+        return dead
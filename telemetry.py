@@ -0,0 +1,145 @@
+"""Bus d'événements de jeu (dégâts, kills, pièces, niveaux, extractions, difficulté, vagues).
+
+emit() ne fait que mettre l'événement dans une file bornée: le thread de la boucle de
+jeu ne touche jamais au disque. Un thread d'arrière-plan vide la file par lots et écrit
+une ligne JSON par événement, avec rotation du fichier (events.jsonl, events.jsonl.1...).
+Si la file est pleine (disque lent), l'événement est abandonné et compté.
+
+Les événements fréquents sont limités en débit (RATE_LIMITS, en ticks simulés): ceux
+qui arrivent trop tôt sont comptés et le total est joint au suivant ("suppressed").
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+TELEMETRY_PATH = "events.jsonl"
+QUEUE_SIZE = 4096                 # événements en attente au plus
+MAX_FILE_BYTES = 5 * 1024 * 1024  # rotation au-delà de 5 Mo
+BACKUP_FILES = 3                  # fichiers tournés gardés
+FLUSH_INTERVAL_S = 0.5
+# Type d'événement -> ticks minimum entre deux événements écrits (10 par seconde au plus)
+RATE_LIMITS = {"damage": 6, "pickup": 6, "kill": 6}
+
+
+class Telemetry:
+    """File d'événements bornée vidée dans un fichier JSONL tournant par un thread d'arrière-plan."""
+
+    def __init__(self, path=TELEMETRY_PATH, capacity=QUEUE_SIZE, max_bytes=MAX_FILE_BYTES,
+                 backups=BACKUP_FILES, rate_limits=RATE_LIMITS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rate_limits = dict(rate_limits)
+        self.queue = queue.Queue(maxsize=capacity)
+        # Type -> tick du dernier événement mis en file / événements limités depuis
+        self.last_emit = {}
+        self.suppressed = {}
+        # Compteurs
+        self.emitted = 0
+        self.limited = 0
+        self.dropped = 0
+        self.written = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def emit(self, kind, tick, **fields):
+        """Met un événement en file sans jamais bloquer. Retourne False s'il est limité ou abandonné."""
+        if self.closed:
+            return False
+        limit = self.rate_limits.get(kind)
+        if limit:
+            last = self.last_emit.get(kind)
+            if last is not None and tick - last < limit:
+                self.suppressed[kind] = self.suppressed.get(kind, 0) + 1
+                self.limited += 1
+                return False
+            self.last_emit[kind] = tick
+            skipped = self.suppressed.pop(kind, 0)
+            if skipped:
+                fields["suppressed"] = skipped
+        event = {"event": kind, "tick": tick, "time": round(time.time(), 3)}
+        event.update(fields)
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.emitted += 1
+        return True
+
+    # --- Thread d'écriture ---
+    def _run(self):
+        file = None
+        size = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                batch = [self.queue.get(timeout=FLUSH_INTERVAL_S)]
+            except queue.Empty:
+                batch = []
+            # Vider ce qui est déjà en file: une écriture par lot
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            lines = "".join(json.dumps(event) + "\n" for event in batch if event is not None)
+            try:
+                if lines:
+                    if file is None:
+                        file = open(self.path, "a", encoding="utf-8")
+                        size = file.tell()
+                    if size + len(lines) > self.max_bytes and size > 0:
+                        file.close()
+                        self._rotate()
+                        file = open(self.path, "a", encoding="utf-8")
+                        size = 0
+                    file.write(lines)
+                    size += len(lines)
+                    self.written += len(batch) - stop
+                now = time.monotonic()
+                if file is not None and (stop or now - last_flush >= FLUSH_INTERVAL_S):
+                    file.flush()
+                    last_flush = now
+            except OSError:
+                # Disque plein ou fichier verrouillé: le lot est perdu, le jeu continue
+                self.write_errors += 1
+                self.dropped += len(batch) - stop
+            if stop:
+                if file is not None:
+                    file.close()
+                return
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def close(self, timeout=2.0):
+        """Écrit les événements en file puis arrête le thread (attend au plus timeout secondes)."""
+        if self.closed:
+            return
+        self.closed = True
+        # put bloquant: la boucle de jeu est terminée, on attend une place pour le signal d'arrêt
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+    def report(self):
+        return (f"Télémétrie: {self.emitted} événements en file, {self.written} écrits dans {self.path}, "
+                f"{self.limited} limités en débit, {self.dropped} abandonnés, {self.rotations} rotations"
+                + (f", {self.write_errors} erreurs d'écriture" if self.write_errors else ""))
@@ -0,0 +1,70 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextCache:
+    """Cache LRU des textes rendus, clé (police, texte, couleur, antialias).
+
+    Les polices sont créées une seule fois par spec (nom, taille). Les surfaces les moins
+    récemment utilisées sont évincées quand la mémoire estimée dépasse max_bytes.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, spec):
+        """Retourne la police pour spec = (nom, taille), chargée une seule fois."""
+        font = self.fonts.get(spec)
+        if font is None:
+            font = pygame.font.SysFont(*spec)
+            self.fonts[spec] = font
+        return font
+
+    def preload(self, *specs):
+        """Charge les polices au démarrage pour ne jamais les charger pendant une frame."""
+        for spec in specs:
+            self.font(spec)
+
+    def render(self, spec, text, antialias, color):
+        """Équivalent de font.render(text, antialias, color); la surface retournée est partagée."""
+        key = (spec, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(spec).render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.bytes_used += self._size_of(surface)
+        # Éviction LRU tant qu'on dépasse le plafond (on garde au moins la dernière surface)
+        while self.bytes_used > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes_used -= self._size_of(old)
+            self.evictions += 1
+        return surface
+
+    @staticmethod
+    def _size_of(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes_used = 0
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        return (f"Cache texte: {self.hits} hits, {self.misses} misses ({rate:.1f}% hits), "
+                f"{len(self.surfaces)} surfaces, {self.bytes_used // 1024} Ko, {self.evictions} évictions")
+
+
+# Cache partagé par le HUD, le village et le menu principal
+text_cache = TextCache()
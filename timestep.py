@@ -0,0 +1,53 @@
+from world import TICK_MS
+
+
+class FixedTimestep:
+    """Accumulateur de temps réel converti en ticks de simulation de durée fixe.
+
+    Si l'affichage prend du retard, plusieurs ticks sont joués dans la même frame
+    (rattrapage, au plus max_catchup) au lieu de ralentir le jeu; au-delà, le temps
+    en trop est abandonné pour ne pas entrer dans une spirale de rattrapage.
+    """
+
+    def __init__(self, tick_ms=TICK_MS, max_catchup=5):
+        self.tick_ms = tick_ms
+        self.max_catchup = max_catchup
+        self.accumulator = 0.0
+        # Compteurs
+        self.frames = 0
+        self.ticks = 0
+        self.catchup_frames = 0   # frames avec plus d'un tick
+        self.idle_frames = 0      # frames sans tick (affichage plus rapide que la simulation)
+        self.max_ticks_in_frame = 0
+        self.dropped_ms = 0.0
+
+    def advance(self, elapsed_ms):
+        """Ajoute elapsed_ms de temps réel et retourne le nombre de ticks à jouer maintenant."""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.tick_ms)
+        if steps > self.max_catchup:
+            dropped = (steps - self.max_catchup) * self.tick_ms
+            self.accumulator -= dropped
+            self.dropped_ms += dropped
+            steps = self.max_catchup
+        self.accumulator -= steps * self.tick_ms
+
+        self.frames += 1
+        self.ticks += steps
+        if steps > 1:
+            self.catchup_frames += 1
+        elif steps == 0:
+            self.idle_frames += 1
+        self.max_ticks_in_frame = max(self.max_ticks_in_frame, steps)
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction du prochain tick déjà écoulée, pour interpoler l'affichage (0..1)."""
+        return self.accumulator / self.tick_ms
+
+    def report(self):
+        ratio = self.ticks / self.frames if self.frames else 0
+        return (f"Pas fixe: {self.ticks} ticks / {self.frames} frames ({ratio:.2f} ticks/frame), "
+                f"{self.catchup_frames} frames de rattrapage (max {self.max_ticks_in_frame} ticks), "
+                f"{self.idle_frames} frames sans tick, {self.dropped_ms:.0f} ms abandonnées")
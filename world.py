@@ -0,0 +1,420 @@
+import random
+import time
+import zlib
+
+import pygame
+
+from arena import placement_rng
+from director import WaveDirector
+from enemy import enemy_pool
+from entity import separate_sprites
+from gold import gold_pool
+from ranged_enemy import RangedEnemy, ranged_enemy_pool
+from spatial import SeparationSolver
+from stats import derived_stats
+from collision import SweptCollider
+from swarm import SwarmGroup, HAVE_NUMPY
+
+# --- Configuration de la mission ---
+TICK_MS = 1000 / 60              # durée simulée d'un tick (60 ticks par seconde)
+MAX_ENEMIES = 10                 # max d'ennemis simultanés (vagues: director.py)
+EXTRACT_SIZE = 80
+EXTRACT_DELAY_MS = 5000          # délai entre apparitions (ms)
+EXTRACT_DURATION_MS = 5000       # durée active (ms)
+SEPARATION_PASSES = 2            # passes de relaxation par tick
+
+
+class TickInput:
+    """Entrées d'un tick: direction (-1/0/1 sur chaque axe), positions visées par les tirs,
+    nombre maximal d'updates d'ennemis lointains (None: pas de limite, voir lod.py) et
+    plafond d'ennemis (None: celui de la mission, voir director.EnemyCapController)."""
+
+    def __init__(self, dx=0, dy=0, shots=(), lod_quota=None, enemy_cap=None):
+        self.dx = dx
+        self.dy = dy
+        self.shots = list(shots)
+        self.lod_quota = lod_quota
+        self.enemy_cap = enemy_cap
+
+
+class World:
+    """État complet d'une mission et de la progression, avancé tick par tick par tick().
+
+    Aucune dépendance à l'écran, à l'horloge réelle, au clavier ni au random global:
+    le temps est simulé (TICK_MS par tick) et le hasard vient de self.rng, donc deux
+    mondes créés avec la même graine et recevant les mêmes entrées restent identiques.
+    """
+
+    def __init__(self, screen_rect, player, seed=None, swarm=HAVE_NUMPY, telemetry=None, lod=None, arena=None,
+                 director=None, max_enemies=None):
+        self.screen_rect = screen_rect
+        self.player = player
+        # Arène: l'écran par défaut, ou une grande arène découpée en chunks (arena.ChunkedArena)
+        # que la caméra parcourt en suivant le joueur
+        self.arena = arena
+        self.bounds = arena.rect if arena else screen_rect
+        self.camera = pygame.Rect(0, 0, screen_rect.width, screen_rect.height)
+        self.prev_camera = self.camera.topleft
+        # Nombre d'ennemis proportionnel à la surface de l'arène
+        area_ratio = (self.bounds.width * self.bounds.height) / (screen_rect.width * screen_rect.height)
+        self.max_enemies = max_enemies or max(MAX_ENEMIES, int(MAX_ENEMIES * area_ratio))
+        self.initial_enemies = max(5, int(5 * area_ratio))
+        if arena:
+            player.screen_rect = self.bounds
+            player.rect.center = self.bounds.center
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Bus d'événements (telemetry.Telemetry), None: aucun événement émis
+        self.telemetry = telemetry
+        self.now = 0.0     # temps simulé (ms)
+        self.ticks = 0
+
+        # Progression entre les missions
+        self.difficulty_multiplier = 1.0  # augmente avec chaque extraction
+        self.extractions_count = 0
+        self.banked_gold = 0
+        self.banked_xp = 0
+        self.gold_multiplier = 1.0  # Multiplicateur d'or selon le Marché
+        self.xp_multiplier = 1.0    # Multiplicateur d'XP selon la Bibliothèque
+        self.refresh_rewards()
+
+        # Sprites de la mission
+        self.swarm = swarm
+        self.enemies = SwarmGroup(self.bounds) if swarm else pygame.sprite.Group()
+        self.projectiles = pygame.sprite.Group()
+        self.enemy_projectiles = pygame.sprite.Group()  # Projectiles tirés par les ennemis
+        self.golds = pygame.sprite.Group()
+        self.separation_solver = SeparationSolver(passes=SEPARATION_PASSES)
+        # Ordonnanceur d'updates par distance (lod.UpdateScheduler), seulement sans le mode
+        # essaim: son update vectorisé coûte moins que la répartition par niveaux
+        if lod and swarm:
+            raise ValueError("L'ordonnanceur LOD demande le mode essaim coupé (swarm=False)")
+        self.lod = lod
+        self.collider = SweptCollider()
+
+        # Vagues d'ennemis (planifiées à chaque mission) et zone d'extraction
+        self.director = director or WaveDirector()
+        self.extraction_rect = pygame.Rect(0, 0, EXTRACT_SIZE, EXTRACT_SIZE)
+        self.extraction_active = False
+        self.extraction_next_spawn = EXTRACT_DELAY_MS
+        self.extraction_end_time = 0.0
+
+        self.state = "idle"  # idle, running, dead, extracted
+        self.input = TickInput()
+        # Mémoriser la position de début de tick des sprites pour interpoler l'affichage
+        self.track_previous = False
+
+        # Phases d'un tick, dans l'ordre (nommées pour les mesures de performance)
+        self.phases = [
+            ("previous", self.phase_previous),
+            ("input", self.phase_input),
+            ("streaming", self.phase_streaming),
+            ("update", self.phase_update),
+            ("ranged_shoot", self.phase_ranged_shoot),
+            ("player_hits", self.phase_player_hits),
+            ("separation", self.phase_separation),
+            ("projectile_hits", self.phase_projectile_hits),
+            ("pickups", self.phase_pickups),
+            ("spawn", self.phase_spawn),
+            ("extraction", self.phase_extraction),
+        ]
+
+    def event(self, kind, **fields):
+        """Émet un événement de jeu (sans effet sur la simulation)."""
+        if self.telemetry:
+            self.telemetry.emit(kind, self.ticks, **fields)
+
+    # --- Cycle de vie d'une mission ---
+    def spawn_wave(self, wave):
+        """Place les ennemis d'une vague, pris dans les réserves, dans la limite du plafond."""
+        # Le plafond du tick (EnemyCapController) remplace celui de la mission, au-dessus comme en dessous
+        cap = self.max_enemies if self.input.enemy_cap is None else self.input.enemy_cap
+        count = min(len(wave), max(0, cap - self.enemy_count()))
+        self.director.spawned += count
+        self.director.capped += len(wave) - count
+        if not count:
+            return
+        base_hp, base_damage, ranged_hp = self.spawn_stats()
+        bounds = self.bounds
+        positions = wave.positions
+        spawned = []
+        for i, kind in enumerate(wave.kinds[:count]):
+            if kind:
+                enemy = ranged_enemy_pool.acquire(bounds, hp=ranged_hp, damage=base_damage, rng=placement_rng)
+            else:
+                enemy = enemy_pool.acquire(bounds, hp=base_hp, damage=base_damage, rng=placement_rng)
+            enemy.rect.center = (positions[2 * i], positions[2 * i + 1])
+            spawned.append(enemy)
+        self.enemies.add(spawned)
+        self.event("wave", size=len(wave), spawned=count, enemies=self.enemy_count())
+
+    def start_mission(self, buildings):
+        """Applique les bonus des bâtiments et prépare une nouvelle mission."""
+        self.player.apply_upgrade_bonuses(buildings)
+
+        # Multiplicateurs d'or et d'XP des bâtiments (Marché, Bibliothèque)
+        stats = derived_stats(buildings)
+        self.gold_multiplier = stats.gold_multiplier
+        self.xp_multiplier = stats.xp_multiplier
+        self.refresh_rewards()
+
+        # Réinitialiser les sprites et les groupes pour la nouvelle mission
+        self.clear_sprites()
+        # Planning des vagues: la première (initial_enemies ennemis) arrive tout de suite
+        self.director.plan(self.rng.getrandbits(32), self.bounds, self.player.level,
+                           self.difficulty_multiplier, self.now, self.initial_enemies)
+        # Réserves remplies d'avance pour les plus grosses vagues: leur arrivée n'alloue rien
+        for pool, peak in zip((enemy_pool, ranged_enemy_pool), self.director.peak_sizes()):
+            pool.prefill(min(peak, self.max_enemies), self.bounds, rng=placement_rng)
+        self.input = TickInput()
+        for wave in self.director.due(self.now):
+            self.spawn_wave(wave)
+        self.extraction_active = False
+        self.extraction_next_spawn = self.now + EXTRACT_DELAY_MS
+        self.update_camera()
+        self.prev_camera = self.camera.topleft
+        self.state = "running"
+
+    def clear_sprites(self):
+        """Vide les groupes de la mission; kill() rend les ennemis, les projectiles et l'or à leur réserve."""
+        for sprite in (self.enemies.sprites() + self.projectiles.sprites() + self.enemy_projectiles.sprites()
+                       + self.golds.sprites()):
+            sprite.kill()
+        if self.arena:
+            self.arena.clear()
+
+    def enemy_count(self):
+        """Ennemis actifs et, dans une grande arène, endormis."""
+        return len(self.enemies) + (self.arena.dormant_enemies if self.arena else 0)
+
+    def update_camera(self):
+        if self.arena:
+            self.camera.center = self.player.rect.center
+            self.camera.clamp_ip(self.bounds)
+
+    def screen_to_world(self, pos):
+        """Position à l'écran (souris) -> position dans l'arène."""
+        return (pos[0] + self.camera.x, pos[1] + self.camera.y)
+
+    def set_extractions(self, count):
+        """Nombre d'extractions réussies, qui fixe la difficulté des prochains ennemis."""
+        self.extractions_count = count
+        self.difficulty_multiplier = 1.0 + (count * 0.25)  # +25% per extraction
+        self.refresh_rewards()
+
+    def refresh_rewards(self):
+        """Recalcule les récompenses d'un kill et les stats des ennemis après un changement
+        de difficulté ou de multiplicateurs (start_mission, set_extractions, snapshot.loads)."""
+        self.kill_xp = int(10 * self.difficulty_multiplier * self.xp_multiplier)
+        self.kill_gold = int(5 * self.difficulty_multiplier * self.gold_multiplier)
+        self.spawn_stats_key = None
+
+    def spawn_stats(self):
+        """(hp, dégâts, hp à distance) des nouveaux ennemis, recalculés quand le niveau du joueur change."""
+        level = self.player.level
+        if self.spawn_stats_key != level:
+            # Calcul de la difficulté basée sur le niveau du joueur ET la difficulté générale
+            player_level_multiplier = max(1.0, level * 0.2)  # +20% par niveau
+            total_multiplier = self.difficulty_multiplier * player_level_multiplier
+            self.spawn_stats_cache = (max(3, int(3 * total_multiplier)), max(1, int(1 * total_multiplier)),
+                                      max(2, int(2 * total_multiplier)))
+            self.spawn_stats_key = level
+        return self.spawn_stats_cache
+
+    def tick(self, inp=None, on_phase=None):
+        """Avance la simulation d'un tick. Retourne self.state.
+
+        on_phase(nom, ms), si fourni, reçoit la durée de chaque phase.
+        """
+        self.input = inp or TickInput()
+        self.now += TICK_MS
+        self.ticks += 1
+        for name, phase in self.phases:
+            if on_phase is None:
+                phase()
+            else:
+                start = time.perf_counter()
+                phase()
+                on_phase(name, (time.perf_counter() - start) * 1000)
+            if self.state != "running":
+                break
+        return self.state
+
+    # --- Phases ---
+    def phase_previous(self):
+        if not self.track_previous:
+            return
+        tick = self.ticks
+        for group in (self.enemies, self.projectiles, self.enemy_projectiles):
+            for sprite in group:
+                sprite.prev_pos = sprite.rect.topleft
+                sprite.prev_tick = tick
+        self.player.prev_pos = self.player.rect.topleft
+        self.player.prev_tick = tick
+        self.prev_camera = self.camera.topleft
+
+    def phase_input(self):
+        inp = self.input
+        # Tir: espace ou clic gauche
+        for target in inp.shots:
+            proj = self.player.shoot(target, self.now)
+            if proj:
+                self.projectiles.add(proj)
+        self.player.update((inp.dx, inp.dy))
+
+    def phase_streaming(self):
+        # La caméra suit le joueur; les chunks autour d'elle sont réveillés, les autres endormis
+        if self.arena:
+            self.update_camera()
+            self.arena.stream(self)
+
+    def phase_update(self):
+        if self.lod:
+            self.lod.update(self.enemies, self.player, self.input.lod_quota)
+        else:
+            self.enemies.update(self.player)
+        self.projectiles.update()
+        self.enemy_projectiles.update()
+
+    def phase_ranged_shoot(self):
+        # Les ennemis à distance tirent
+        for enemy in self.enemies:
+            if isinstance(enemy, RangedEnemy):
+                proj = enemy.shoot(self.player, self.now)
+                if proj:
+                    self.enemy_projectiles.add(proj)
+
+    def phase_player_hits(self):
+        player = self.player
+        # Détection des collisions (hitbox)
+        # Vérifier les collisions avant séparation pour appliquer les dégâts
+        if self.swarm:
+            damage_taken = self.enemies.contact_damage(player.rect)
+        else:
+            damage_taken = sum(getattr(e, 'damage', 1) for e in pygame.sprite.spritecollide(player, self.enemies, False))
+        if damage_taken:
+            player.hp -= damage_taken
+            self.event("damage", source="contact", amount=damage_taken, hp=player.hp)
+            if player.hp <= 0:
+                # Bank XP on death (no gold)
+                self.banked_xp += getattr(player, 'xp', 0)
+                self.event("death", banked_xp=self.banked_xp, level=player.level)
+                self.state = "dead"
+                return
+
+        # Collisions avec les projectiles ennemis
+        enemy_proj_hits = pygame.sprite.spritecollide(player, self.enemy_projectiles, True)
+        if enemy_proj_hits:
+            damage_taken = sum(getattr(p, 'damage', 1) for p in enemy_proj_hits)
+            player.hp -= damage_taken
+            self.event("damage", source="projectile", amount=damage_taken, hp=player.hp)
+
+    def phase_separation(self):
+        # Résolution des collisions entre ennemis (ne doivent pas se chevaucher)
+        # Grille spatiale: seules les cellules voisines sont testées
+        self.separation_solver.solve(self.enemies)
+
+        # Empêcher les ennemis d'entrer dans le joueur: on pousse seulement l'ennemi
+        for enemy in self.enemies:
+            separate_sprites(self.player, enemy, push_a=False, push_b=True)
+
+    def phase_projectile_hits(self):
+        # Projectiles qui touchent des ennemis (balayage de la trajectoire du tick, grille spatiale)
+        proj_hits = self.collider.collide(self.projectiles, self.enemies)
+        if not proj_hits:
+            return
+        hit_pairs = [(enemy, getattr(proj, 'damage', 1)) for proj, hit_enemies in proj_hits.items() for enemy in hit_enemies]
+        if self.swarm:
+            killed = self.enemies.apply_damage(hit_pairs)
+        else:
+            killed = [enemy for enemy, dmg in hit_pairs if enemy.take_damage(dmg)]
+        level = self.player.level
+        for enemy in killed:
+            # spawn gold, remove enemy (no automatic respawn on kill)
+            self.golds.add(gold_pool.acquire(enemy.rect.center, value=self.kill_gold))
+            enemy.kill()
+            # award XP to player for the kill
+            if hasattr(self.player, 'add_xp'):
+                self.player.add_xp(self.kill_xp)
+        if killed:
+            self.event("kill", count=len(killed), enemies=self.enemy_count())
+        if self.player.level != level:
+            self.event("level_up", level=self.player.level, max_hp=self.player.max_hp)
+
+    def phase_pickups(self):
+        # Player collecte l'or
+        collected = pygame.sprite.spritecollide(self.player, self.golds, True)
+        if collected:
+            for g in collected:
+                self.player.gold += int(g.value * self.gold_multiplier)
+            self.event("pickup", count=len(collected), gold=self.player.gold)
+
+    def phase_spawn(self):
+        # Vagues arrivées (indépendantes des kills); sinon on avance le planning d'une vague
+        waves = self.director.due(self.now)
+        for wave in waves:
+            self.spawn_wave(wave)
+        if not waves:
+            self.director.fill()
+
+    def phase_extraction(self):
+        now = self.now
+        # Gestion temporaire de la zone d'extraction (apparitions périodiques)
+        if not self.extraction_active and now >= self.extraction_next_spawn:
+            self.extraction_active = True
+            # Place the extraction zone at a random location within the camera view (with margin)
+            margin = 10
+            view = self.camera
+            x = view.left + self.rng.randint(margin, view.width - EXTRACT_SIZE - margin)
+            y = view.top + self.rng.randint(margin, view.height - EXTRACT_SIZE - margin)
+            self.extraction_rect.topleft = (x, y)
+            self.extraction_end_time = now + EXTRACT_DURATION_MS
+        if self.extraction_active and now >= self.extraction_end_time:
+            self.extraction_active = False
+            self.extraction_next_spawn = now + EXTRACT_DELAY_MS
+
+        # Extraction: si la zone est active et le joueur y entre, fin de la partie
+        if self.extraction_active and self.player.rect.colliderect(self.extraction_rect):
+            self.extract()
+
+    def extract(self):
+        player = self.player
+        # Bank the gold and XP on successful extraction
+        self.banked_gold += player.gold
+        # bank XP as well
+        self.banked_xp += getattr(player, 'xp', 0)
+        player.gold = 0
+        player.xp = 0
+        # Heal player fully on extraction
+        if hasattr(player, 'heal_full'):
+            player.heal_full()
+        # Increase difficulty
+        self.set_extractions(self.extractions_count + 1)
+        self.event("extraction", banked_gold=self.banked_gold, banked_xp=self.banked_xp,
+                   extractions=self.extractions_count)
+        self.event("difficulty", multiplier=round(self.difficulty_multiplier, 3))
+
+        # Retour au village pour les améliorations
+        self.state = "extracted"
+        # Réinitialiser le joueur pour la prochaine mission, mais garder le niveau et XP banké
+        player_level_backup = player.level
+        player.reset()
+        player.level = player_level_backup
+
+    # --- Vérification du déterminisme ---
+    def state_digest(self):
+        """Empreinte CRC32 de l'état simulé, pour comparer deux exécutions.
+
+        Les points de vie sont comparés en float (3 et 3.0 donnent la même empreinte).
+        """
+        player = self.player
+        parts = [
+            (self.ticks, player.rect.topleft, float(player.hp), player.xp, player.level, player.gold),
+            (self.banked_gold, self.banked_xp, self.extractions_count, self.state),
+            (self.extraction_active, self.extraction_rect.topleft),
+        ]
+        for group in (self.enemies, self.projectiles, self.enemy_projectiles, self.golds):
+            parts.append(sorted((s.rect.topleft, float(getattr(s, 'hp', 0))) for s in group))
+        if self.arena:
+            parts.append(self.arena.digest_parts())
+        return zlib.crc32(repr(parts).encode())